@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+
+from app.core.metrics import NER_BATCH_SENTENCES, NER_FORWARD_SECONDS
+
+
+class _NerJob:
+    __slots__ = ("text", "result", "error", "done")
+
+    def __init__(self, text):
+        self.text = text
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class NerBatcher:
+    """
+    Scheduler micro-batching untuk NER.
+    Job berukuran kalimat dari banyak request dikumpulkan hingga max_batch_size
+    atau max_wait_ms, lalu dijalankan sebagai satu batch (padding dilakukan oleh
+    pipeline transformers). Hasil span dikembalikan ke masing-masing pemanggil.
+    """
+
+    def __init__(self, ner_pipeline, max_batch_size=16, max_wait_ms=5.0):
+        self.ner_pipeline = ner_pipeline
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._jobs = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+        self._worker.start()
+
+    # PUBLIC API
+    def submit(self, texts):
+        """Menjalankan NER untuk setiap teks; memblokir hingga semua hasil tersedia."""
+        if self._closed: raise RuntimeError("NER batcher is closed.")
+        jobs = [_NerJob(text) for text in texts]
+        for job in jobs: self._queue.put(job)
+        results = []
+        for job in jobs:
+            job.done.wait()
+            if job.error is not None: raise job.error
+            results.append(job.result)
+        return results
+
+    def stats(self):
+        with self._stats_lock:
+            batches, jobs = self._batches, self._jobs
+        capacity = batches * self.max_batch_size
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches": batches,
+            "jobs": jobs,
+            "avg_batch_size": jobs / batches if batches else 0.0,
+            "batch_fill_ratio": jobs / capacity if capacity else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    # SCHEDULER LOOP
+    def _collect(self):
+        job = self._queue.get()
+        if job is None: return None
+        batch = [job]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                self._queue.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None: return
+            started = time.perf_counter()
+            try:
+                if len(batch) == 1:
+                    outputs = [self.ner_pipeline(batch[0].text)]
+                else:
+                    outputs = self.ner_pipeline([job.text for job in batch], batch_size=len(batch))
+                NER_FORWARD_SECONDS.observe(time.perf_counter() - started)
+                NER_BATCH_SENTENCES.observe(len(batch))
+                for job, output in zip(batch, outputs): job.result = output
+            except Exception as e:
+                for job in batch: job.error = e
+            with self._stats_lock:
+                self._batches += 1
+                self._jobs += len(batch)
+            for job in batch: job.done.set()
@@ -0,0 +1,180 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+# SQLITE
+# Basis data SQLite (cache paragraf, antrean job) ditulis bersamaan oleh proses API dan
+# proses worker: penulis menunggu kunci selama SQLITE_BUSY_TIMEOUT detik, dan penulisan
+# yang tetap gagal karena basis data terkunci diulang beberapa kali sebelum menyerah.
+SQLITE_BUSY_TIMEOUT = float(os.environ.get("SQLITE_BUSY_TIMEOUT", "30"))
+SQLITE_LOCK_RETRIES = 5
+
+
+def connect_sqlite(path, **kwargs):
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False, **kwargs)
+    conn.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT * 1000)}")
+    return conn
+
+
+def is_locked(error):
+    message = str(error)
+    return "database is locked" in message or "database is busy" in message
+
+
+def retry_locked(fn, *args, retries=SQLITE_LOCK_RETRIES, delay=0.05):
+    """Menjalankan fn(*args), mengulang dengan backoff jika SQLite masih terkunci setelah busy timeout."""
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args)
+        except sqlite3.OperationalError as e:
+            if attempt == retries or not is_locked(e): raise
+            logger.debug("SQLite %s; retrying (%d/%d)", e, attempt + 1, retries)
+            time.sleep(delay * 2 ** attempt)
+
+
+class LRUCache:
+    """
+    Cache LRU berbatas yang aman dipakai dari banyak thread, dengan statistik
+    hits/misses/evictions. bind(version) mengosongkan cache ketika versi data
+    yang mendasarinya (misalnya kamus) berubah.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def bind(self, version):
+        with self._lock:
+            if version != self.version:
+                self._data.clear()
+                self.version = version
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class DiskStore:
+    """
+    Penyimpanan key-value SQLite untuk cache yang harus bertahan setelah restart.
+    Entri dari versi lain dihapus saat store dibuka; jumlah baris dibatasi
+    max_rows dengan menghapus entri yang paling lama ditulis.
+    """
+
+    def __init__(self, path, version, max_rows=200_000):
+        self.path = path
+        self.version = version
+        self.max_rows = max_rows
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = connect_sqlite(path)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        with self._lock: retry_locked(self._setup)
+
+    def _setup(self):
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM entries WHERE version != ?", (self.version,))
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE version = ? AND key IN ({','.join('?' * len(chunk))})",
+                    (self.version, *chunk),
+                )
+                for key, value in rows: found[key] = json.loads(value)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        if not items: return
+        rows = [(key, self.version, json.dumps(value, ensure_ascii=False)) for key, value in items.items()]
+        with self._lock:
+            retry_locked(self._write, rows)
+            self.writes += len(rows)
+
+    def _write(self, rows):
+        # Transaksi dibatalkan seluruhnya jika gagal, sehingga aman diulang
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO entries (key, version, value) VALUES (?, ?, ?)", rows)
+            self._conn.execute(
+                "DELETE FROM entries WHERE rowid <= (SELECT MAX(rowid) FROM entries) - ?", (self.max_rows,)
+            )
+
+    def stats(self):
+        with self._lock:
+            (rows,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return {
+                "path": self.path,
+                "rows": rows,
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Cache keputusan ejaan per token, dipakai bersama oleh seluruh request di proses ini
+SPELLING_CACHE = LRUCache(maxsize=int(os.environ.get("SPELLING_CACHE_SIZE", "100000")))
+
+# Cache hasil koreksi per paragraf (teks + log), dengan key hash konten
+PARAGRAPH_CACHE = LRUCache(maxsize=int(os.environ.get("PARAGRAPH_CACHE_SIZE", "20000")))
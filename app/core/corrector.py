@@ -1,354 +1,637 @@
 import re
 import os
-import requests
+import threading
+import time
+from bisect import bisect_left
+from logging import getLogger
 from symspellpy import SymSpell, Verbosity
 from num2words import num2words
-from transformers import pipeline, logging
+from transformers import logging
+
+from app.core.batching import NerBatcher
+from app.core.cache import PARAGRAPH_CACHE, SPELLING_CACHE, DiskStore
+from app.core.gazetteer import build_gazetteer
+from app.core.dictionary import (
+    DATA_DIR, EXPANDED_DICT_FILENAME, ROOT_DICT_FILENAME, ROOTS_FILENAME,
+    DictionaryArtifactError, read_roots, verify_artifact,
+)
+from app.core.metrics import (
+    CORRECTIONS_TOTAL, DOCUMENT_CHARS, STAGE_SECONDS, SYMSPELL_LOOKUP_SECONDS, TOKENS_TOTAL, StageClock,
+)
+from app.core.lexicon import get_manual_cities, get_provinces_and_islands, get_common_particles, get_extra_words
+from app.core.morphology import MorphologyValidator, apply_morphology
+from app.core.ner import NER_MODEL_NAME, load_ner_pipeline, set_torch_threads
+from app.core.paragraphs import paragraph_key, sentence_starts, split_paragraphs
+from app.core.result import CorrectionContext, CorrectionResult
+from app.core.snapshot import file_sha256, load_symspell
+from app.core.spans import SpanIndex
+from app.core.tokens import DIGIT_PATTERN, FLAG_DIGIT, FLAG_GLUED, FLAG_PUNCT, TokenArray
 
 # CONFIGURATION
 logging.set_verbosity_error()
+# Log per request hanya di level debug; observabilitas rutin lewat /metrics
+logger = getLogger(__name__)
+
+SYMSPELL_MAX_EDIT_DISTANCE = 2
+SYMSPELL_PREFIX_LENGTH = 7
+
+# Batas panjang satu job NER (karakter); kalimat yang lebih panjang dipotong di spasi
+NER_MAX_CHARS = 1000
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]*[.!?]+|[^.!?\n]+')
+
+# Pola stage koreksi (dikompilasi sekali)
+REDUPLICATION_PATTERN = re.compile(r'\b([a-zA-Z]+) (\1)\b', re.IGNORECASE)
+NON_WORD_CHARS = re.compile(r'[^\w\-]')
+NUMBER_PATTERN = re.compile(r'\b\d[\d.]*\b')
+KPST_CANDIDATE = re.compile(r'(?:^|(?<=[\s.,;:?!]))me(?:mp|nt|ns|ngk)[aiueo]|menpegang', re.IGNORECASE)
+KPST_RULES = [
+    (re.compile(r'^memp(?=[aiueo])'), 'mem'),
+    (re.compile(r'^ment(?=[aiueo])'), 'men'),
+    (re.compile(r'^mens(?=[aiueo])'), 'meny'),
+    (re.compile(r'^mengk(?=[aiueo])'), 'meng'),
+]
+
+# Keputusan ejaan per token (disimpan di SPELLING_CACHE)
+SPELLING_VALID = "valid"
+SPELLING_REDUPLICATION = "reduplication"
+SPELLING_SUGGESTION = "suggestion"
+SPELLING_UNKNOWN = "unknown"
+
+# Naikkan jika aturan stage koreksi berubah; cache paragraf versi lama tidak dipakai lagi
+CORRECTION_RULES_VERSION = "2"
+
+# "expanded": kamus hasil ekspansi morfologi penuh
+# "roots": indeks kata dasar + validator morfologi saat lookup
+DICTIONARY_MODES = ("expanded", "roots")
 
 class AdvancedCorrector:
-    def __init__(self):
+    def __init__(self, ner_max_batch_size=16, ner_max_wait_ms=5.0, dictionary_mode="expanded", ner_engine="pytorch",
+                 paragraph_store_path=None, ner_gate=True, ner_pipeline=None):
+        if dictionary_mode not in DICTIONARY_MODES:
+            raise ValueError(f"Unknown dictionary mode: {dictionary_mode}")
+
         # SYSTEM INITIALIZATION
         print("--- System Initialization ---")
         
         # MODEL LOADINGpem
-        print("[1/3] Loading NER Model (cahya/bert-base-indonesian-NER)...")
-        try:
-            self.ner_pipeline = pipeline(
-                "token-classification", 
-                model="cahya/bert-base-indonesian-NER", 
-                tokenizer="cahya/bert-base-indonesian-NER",
-                aggregation_strategy="simple" 
-            )
-        except Exception as e:
-            print(f"    Failed to load BERT model: {e}")
-            self.ner_pipeline = None
+        # ner_pipeline: pipeline siap pakai (mis. stub benchmark); model tidak dimuat
+        self.ner_engine = ner_engine if ner_pipeline is None else "custom"
+        if ner_pipeline is not None:
+            print("[1/3] Using provided NER pipeline...")
+            self.ner_pipeline = ner_pipeline
+        else:
+            print(f"[1/3] Loading NER Model ({NER_MODEL_NAME}, engine: {ner_engine})...")
+            try:
+                self.ner_pipeline = load_ner_pipeline(ner_engine)
+            except Exception as e:
+                print(f"    Failed to load BERT model: {e}")
+                self.ner_pipeline = None
+
+        # NER MICRO-BATCHING
+        self.ner_batcher = None
+        if self.ner_pipeline:
+            self.ner_batcher = NerBatcher(self.ner_pipeline, ner_max_batch_size, ner_max_wait_ms)
+
+        # GAZETTEER & NER GATE
+        # Frasa tempat dikapitalisasi langsung lewat gazetteer; kalimat yang hanya
+        # berisi kata dikenal (tanpa huruf kapital di tengah kalimat atau nama
+        # tempat ambigu) tidak dikirim ke NER
+        self.gazetteer = build_gazetteer()
+        self.ner_gate = ner_gate
+        self._gate_lock = threading.Lock()
+        self._gate_sentences = 0
+        self._gate_skipped = 0
 
         # SYMSPELL SETUP
         print("[2/3] Setting up SymSpell Dictionary...")
-        self.sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        self.sym_spell = SymSpell(max_dictionary_edit_distance=SYMSPELL_MAX_EDIT_DISTANCE, prefix_length=SYMSPELL_PREFIX_LENGTH)
         
         # DATA STORAGE CONFIGURATION
-        self.data_dir = "data"
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
-
-        self.dict_filename = os.path.join(self.data_dir, "full_dictionary_v7_suffix_stacking.txt")
+        self.data_dir = DATA_DIR
+        self.dict_filename = EXPANDED_DICT_FILENAME
+        self.roots_filename = ROOTS_FILENAME
+        self.root_dict_filename = ROOT_DICT_FILENAME
+        self.dictionary_mode = dictionary_mode
+        self.dictionary_version = None
+        self.morph_validator = None
         
-        # DICTIONARY LOADING OR GENERATION
-        if os.path.exists(self.dict_filename):
-            print(f"    Loading cached database: {self.dict_filename}")
-            self.sym_spell.load_dictionary(self.dict_filename, term_index=0, count_index=1)
+        # DICTIONARY LOADING (artefak dibangun offline: python -m scripts.build_dictionary)
+        if dictionary_mode == "roots":
+            self._load_root_dictionary()
         else:
-            self._build_and_save_dictionary()
+            self._load_expanded_dictionary()
+
+        # PARAGRAPH CACHE (versi mencakup aturan, model NER, dan kamus)
+        ner_version = f"{NER_MODEL_NAME}:{self.ner_engine}:gate={int(ner_gate)}" if self.ner_pipeline else "no-ner"
+        self.cache_version = f"{CORRECTION_RULES_VERSION}:{ner_version}:{self.dictionary_version}"
+        PARAGRAPH_CACHE.bind(self.cache_version)
+        self.paragraph_store = None
+        if paragraph_store_path: self.open_paragraph_store(paragraph_store_path)
 
-        self.changes_log = []
+    def open_paragraph_store(self, path):
+        """Membuka cache paragraf SQLite; pada mode preload dipanggil per worker setelah fork."""
+        self.paragraph_store = DiskStore(path, self.cache_version)
+        print(f"    Paragraph cache store: {path}")
+
+    def before_fork(self):
+        """Menghentikan thread scheduler NER agar master di-fork sebagai proses tanpa thread tambahan."""
+        if self.ner_batcher: self.ner_batcher.close()
+
+    def after_fork(self, torch_threads=None):
+        """
+        Dipanggil di proses worker setelah fork dari master yang sudah memuat model.
+        Thread tidak ikut tersalin saat fork, jadi scheduler NER dibuat ulang; session
+        ONNX Runtime (yang membuat thread pool saat dibuat) dimuat ulang per worker.
+        """
+        if self.ner_pipeline and self.ner_engine.startswith("onnx"):
+            self.ner_pipeline = load_ner_pipeline(self.ner_engine)
+        if torch_threads: set_torch_threads(torch_threads)
+        if self.ner_batcher:
+            batcher = self.ner_batcher
+            self.ner_batcher = NerBatcher(self.ner_pipeline, batcher.max_batch_size, batcher.max_wait * 1000.0)
 
     # DATA SOURCES
     def _get_manual_cities(self):
-        raw_cities = "Ambon, Balikpapan, Banda Aceh, Bandar Lampung, Bandung, Banjar, Banjarbaru, Banjarmasin, Batam, Batu, Baubau, Bekasi, Bengkulu, Bima, Binjai, Bitung, Blitar, Bogor, Bontang, Bukittinggi, Cilegon, Cimahi, Cirebon, Denpasar, Depok, Dumai, Gorontalo, Gunungsitoli, Jakarta Barat, Jakarta Pusat, Jakarta Selatan, Jakarta Timur, Jakarta Utara, Jambi, Jayapura, Kediri, Kendari, Kotamobagu, Kupang, Langsa, Lhokseumawe, Lubuk Linggau, Madiun, Magelang, Makassar, Malang, Manado, Mataram, Medan, Metro, Mojokerto, Padang, Padang Panjang, Padangsidempuan, Pagar Alam, Palangka Raya, Palembang, Palopo, Palu, Pangkalpinang, Parepare, Pariaman, Pasuruan, Payakumbuh, Pekalongan, Pekanbaru, Pematangsiantar, Pontianak, Prabumulih, Probolinggo, Sabang, Salatiga, Samarinda, Sawahlunto, Semarang, Serang, Sibolga, Singkawang, Solok, Sorong, Subulussalam, Sukabumi, Sungai Penuh, Surabaya, Surakarta, Tangerang, Tangerang Selatan, Tanjungbalai, Tanjungpinang, Tarakan, Tasikmalaya, Tebing Tinggi, Tegal, Ternate, Tidore Kepulauan, Tomohon, Tual, Yogyakarta"
-        return [city.strip().lower() for city in raw_cities.split(',')]
+        return get_manual_cities()
 
     def _get_provinces_and_islands(self):
-        raw_geo = "Aceh, Sumatera Utara, Sumatera Barat, Riau, Kepulauan Riau, Jambi, Bengkulu, Sumatera Selatan, Kepulauan Bangka Belitung, Lampung, Banten, DKI Jakarta, Jawa Barat, Jawa Tengah, DI Yogyakarta, Jawa Timur, Bali, Nusa Tenggara Barat, Nusa Tenggara Timur, Kalimantan Barat, Kalimantan Tengah, Kalimantan Selatan, Kalimantan Timur, Kalimantan Utara, Sulawesi Utara, Gorontalo, Sulawesi Tengah, Sulawesi Barat, Sulawesi Selatan, Sulawesi Tenggara, Maluku, Maluku Utara, Papua, Papua Barat, Papua Selatan, Papua Tengah, Papua Pegunungan, Papua Barat Daya, Sumatera, Jawa, Kalimantan, Sulawesi, Papua, Bali, Lombok, Sumbawa, Flores, Sumba, Timor, Halmahera, Seram, Buru, Bangka, Belitung, Nias, Mentawai, Madura"
-        return [geo.strip().lower() for geo in raw_geo.split(',')]
+        return get_provinces_and_islands()
 
     def _get_common_particles(self):
-        return ["saya", "aku", "ku", "hamba", "kami", "kita", "kamu", "engkau", "kau", "anda", "kalian", "saudara", "dia", "ia", "beliau", "mereka", "nya", "ini", "itu", "sini", "situ", "sana", "apa", "siapa", "mana", "kapan", "mengapa", "kenapa", "bagaimana", "berapa", "di", "ke", "dari", "pada", "dalam", "atas", "bawah", "kepada", "daripada", "untuk", "bagi", "guna", "buat", "oleh", "dengan", "tentang", "mengenai", "terhadap", "soal", "sejak", "semenjak", "sampai", "hingga", "keluar", "masuk", "dan", "serta", "atau", "tetapi", "tapi", "namun", "melainkan", "sedangkan", "jika", "kalau", "jikalau", "asal", "bila", "manakala", "agar", "supaya", "biar", "sebab", "karena", "lantaran", "sehingga", "maka", "akibatnya", "ketika", "sewaktu", "tatkala", "selagi", "seraya", "sambil", "setelah", "sesudah", "sebelum", "sehabis", "selesai", "bahwa", "yakni", "yaitu", "adalah", "ialah", "merupakan", "biarpun", "meskipun", "walaupun", "sekalipun", "sungguhpun", "padahal", "kendatipun", "kah", "lah", "tah", "pun", "per", "yang", "tak", "tidak", "bukan", "tanpa", "tiada", "belum", "sudah", "telah", "akan", "sedang", "lagi", "pernah", "masih", "baru", "ada", "bisa", "dapat", "boleh", "harus", "mesti", "wajib", "perlu", "butuh", "mau", "ingin", "hendak", "bakal", "sangat", "amat", "terlalu", "paling", "cukup", "kurang", "lebih", "agak", "hanya", "cuma", "saja", "juga", "pun", "nanti", "kemarin", "besok", "lusa", "sekarang", "dahulu", "dulu", "tadi", "barusan", "tentu", "pasti", "yakin", "memang", "barangkali", "mungkin", "bahkan", "malah", "justru", "segera", "langsung", "lantas", "kemudian", "lalu", "akhirnya", "pak", "bapak", "bu", "ibu", "mas", "mbak", "kak", "kakak", "bang", "abang", "dik", "adik", "om", "tante"]
+        return get_common_particles()
 
     # MORPHOLOGICAL GENERATION LOGIC
-    # --- PERBAIKAN LOGIKA MORFOLOGI ---
     def _apply_morphology(self, root):
+        return apply_morphology(root)
+
+    # DICTIONARY LOADING
+    def _load_expanded_dictionary(self):
+        manifest = self._verify_dictionary_artifact(self.dict_filename)
+        print(f"    Loading cached database: {self.dict_filename} ({manifest['word_count']} words)")
+        self._load_symspell_index(self.dict_filename, manifest)
+
+    def _load_root_dictionary(self):
         """
-        Generate kata turunan dengan level imbuhan ganda.
-        Sekarang mendukung huruf B, F, V (Bangun -> Pembangunan).
+        Mode "roots": SymSpell hanya mengindeks kata dasar, kata tambahan, dan
+        daftar bentuk turunan yang sering muncul. Validasi kata turunan
+        dilakukan oleh MorphologyValidator.
         """
-        forms = set()
-        forms.add(root)
-
-        first = root[0]
-        second = root[1] if len(root) > 1 else ""
-        is_vowel = second in 'aiueo'
-
-        def get_nasal_root(prefix, r):
-            if prefix in ['me', 'pe']:
-                # Aturan Peluluhan (KPST)
-                if first == 'k': return prefix + 'ng' + (r[1:] if is_vowel else r)
-                elif first == 'p': return prefix + 'm' + (r[1:] if is_vowel else r)
-                elif first == 's': return prefix + 'ny' + (r[1:] if is_vowel else r)
-                elif first == 't': return prefix + 'n' + (r[1:] if is_vowel else r)
-                
-                # Aturan B, F, V -> Mem/Pem (INI YANG DITAMBAHKAN)
-                # Contoh: Bangun -> Pembangun, Fokus -> Pemfokus
-                elif first in 'bfv': return prefix + 'm' + r
-                
-                # Aturan C, D, J, Z -> Men/Pen
-                # Contoh: Cuci -> Pencuci
-                elif first in 'cdjz': return prefix + 'n' + r
-                
-                # Aturan Vokal, G, H, Kh -> Meng/Peng
-                # Contoh: Ajar -> Pengajar, Huni -> Penghuni
-                elif first in 'gh' or (first=='k' and second=='h'): return prefix + 'ng' + r
-                elif first in 'aiueo': return prefix + 'ng' + r
-                
-                # Huruf L, M, N, R, W, Y -> Tetap (Me/Pe)
-                # Contoh: Larang -> Pelarang
-                elif first in 'lmnrwy': return prefix + r
-                
-            return prefix + r
-
-        def get_ber_ter_root(prefix, r):
-            # Aturan Ber/Ter/Per -> Be/Te/Pe jika huruf awal R
-            # Contoh: Racun -> Beracun (Bukan Berracun)
-            if r.startswith('r'): return prefix[:-1] + r
-            # Contoh: Ajar -> Belajar (Pengecualian khusus, tapi kita generalisir dulu)
-            if r == 'ajar' and prefix == 'ber': return 'bel' + r 
-            return prefix + r
-
-        # --- LEVEL 1: PREFIX DASAR ---
-        level1_bases = set()
-        level1_bases.add(root)
-        
-        # Me- / Pe-
-        base_me = get_nasal_root('me', root)
-        base_pe = get_nasal_root('pe', root) # Bangun -> Pembangun
-        level1_bases.add(base_me) 
-        level1_bases.add(base_pe) 
-        
-        # Di- / Ke- / Se-
-        level1_bases.add('di' + root)
-        level1_bases.add('ke' + root)
-        level1_bases.add('se' + root)
-        
-        # Ber- / Ter- / Per-
-        base_ber = get_ber_ter_root('ber', root)
-        base_ter = get_ber_ter_root('ter', root)
-        base_per = get_ber_ter_root('per', root)
-        level1_bases.add(base_ber)
-        level1_bases.add(base_ter)
-        level1_bases.add(base_per)
-
-        forms.update(level1_bases)
-
-        # --- LEVEL 2: TRANSITIVE/NOUN SUFFIX (-kan, -i, -an) ---
-        level2_bases = set()
-        suffixes_transitive = ['kan', 'i']
-        
-        for base in level1_bases:
-            # 1. Tambah -an (Noun)
-            # Logika: Pembangun (Level 1) + an -> Pembangunan (Level 2)
-            noun_form = base + 'an'
-            level2_bases.add(noun_form)
-            
-            # 2. Tambah -kan / -i (Verb Transitive)
-            if base.startswith(('me', 'di', 'ter')):
-                for suf in suffixes_transitive:
-                    level2_bases.add(base + suf)
-
-        forms.update(level2_bases)
-
-        # --- LEVEL 3: ENCLITICS (SUFFIX STACKING) ---
-        # Menambahkan -nya, -ku, -mu, -lah, -kah ke hasil Level 1 dan 2
-        enclitics = ['nya', 'ku', 'mu']
-        particles = ['lah', 'kah', 'pun']
-
-        candidates_for_enclitics = level1_bases.union(level2_bases)
-
-        for base in candidates_for_enclitics:
-            for enc in enclitics:
-                forms.add(base + enc) # pembangunannya
-            
-            for part in particles:
-                forms.add(base + part)
-
-        return forms
-
-    # DICTIONARY CONSTRUCTION
-    def _build_and_save_dictionary(self):
-        print("    [INFO] Building Ultimate V7 Database (Suffix Stacking)...")
-        final_dictionary = set()
-
-        url_dataset = "https://raw.githubusercontent.com/sastrawi/sastrawi/master/data/kata-dasar.txt"
-        print("    Downloading root words...")
+        print("    [INFO] Using root-only dictionary with morphological validator...")
+        manifest = self._verify_dictionary_artifact(self.root_dict_filename)
+        if not os.path.exists(self.roots_filename) or file_sha256(self.roots_filename) != manifest["roots_sha256"]:
+            raise DictionaryArtifactError(
+                f"{self.roots_filename} changed since {self.root_dict_filename} was built. "
+                f"Rebuild it with: python -m scripts.build_dictionary"
+            )
+        self.morph_validator = MorphologyValidator(read_roots(self.roots_filename), get_extra_words())
+        print(f"    Indexed {manifest['word_count']} roots and frequent forms")
+        self._load_symspell_index(self.root_dict_filename, manifest)
+
+    def _verify_dictionary_artifact(self, path):
+        # Server tidak pernah membangun kamus; artefak harus dibuat offline
         try:
-            r = requests.get(url_dataset)
-            kata_dasar_list = [line.strip().lower() for line in r.text.splitlines() if line.strip()]
-        except Exception as e:
-            print(f"    [ERROR] {e}")
-            kata_dasar_list = []
-
-        print(f"    Generating variations for {len(kata_dasar_list)} root words...")
-        for idx, root in enumerate(kata_dasar_list):
-            variations = self._apply_morphology(root)
-            final_dictionary.update(variations)
-            if idx % 5000 == 0: print(f"    ... {idx} words processed")
-
-        extras = self._get_manual_cities() + self._get_provinces_and_islands() + self._get_common_particles()
-        for item in extras:
-            for part in item.split(): final_dictionary.add(part)
-
-        custom_entities = ["rupiah", "hobi", "proyek", "triliun", "miliar", "juta", "senin", "selasa", "rabu", "kamis", "jumat", "sabtu", "minggu"]
-        final_dictionary.update(custom_entities)
-
-        if os.path.exists(self.dict_filename): os.remove(self.dict_filename)
-        print(f"    Saving {len(final_dictionary)} words to {self.dict_filename}...")
-        
-        with open(self.dict_filename, "w", encoding="utf-8") as f:
-            for word in final_dictionary:
-                if re.match(r'^[a-z\-]+$', word):
-                    f.write(f"{word} 1\n")
-        
-        self.sym_spell.load_dictionary(self.dict_filename, term_index=0, count_index=1)
-        print("    Database construction complete.")
-
-    def log_change(self, type_err, original, fixed):
-        if original != fixed:
-            self.changes_log.append({"Type": type_err, "Original": original, "Fixed": fixed})
-
-    # CORRECTION PIPELINE
-    def fix_punctuation_spacing(self, text):
-        text = re.sub(r'\s+([.,;:?!])', r'\1', text)
-        return re.sub(r'([.,;:?!])(?=[a-zA-Z])', r'\1 ', text)
-
-    def fix_reduplication(self, text):
-        pattern = r'\b([a-zA-Z]+) \1\b'
-        def replacement(match):
-            fixed = f"{match.group(1)}-{match.group(1)}"
-            self.log_change("Reduplication", match.group(0), fixed)
-            return fixed
-        return re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-
-    def fix_kpst_correction_pre(self, text):
-        words = text.split()
-        fixed_words = []
-        for word in words:
-            original = word
-            clean_word = word.lower()
-            if re.match(r'^memp[aiueo]', clean_word):
-                fixed = re.sub(r'^memp', 'mem', clean_word); self.log_change("KPST Correction", original, fixed); fixed_words.append(fixed); continue
-            if re.match(r'^ment[aiueo]', clean_word):
-                fixed = re.sub(r'^ment', 'men', clean_word); self.log_change("KPST Correction", original, fixed); fixed_words.append(fixed); continue
-            if re.match(r'^mens[aiueo]', clean_word):
-                fixed = re.sub(r'^mens', 'meny', clean_word); self.log_change("KPST Correction", original, fixed); fixed_words.append(fixed); continue
-            if re.match(r'^mengk[aiueo]', clean_word):
-                fixed = re.sub(r'^mengk', 'meng', clean_word); self.log_change("KPST Correction", original, fixed); fixed_words.append(fixed); continue
-            if 'menpegang' in clean_word:
-                 fixed = clean_word.replace('menpegang', 'memegang'); self.log_change("KPST/Typo Correction", original, fixed); fixed_words.append(fixed); continue
-            fixed_words.append(word)
-        return " ".join(fixed_words)
-
-    def fix_spelling_advanced(self, text):
-        protected_ranges = []
-        if self.ner_pipeline:
-            ner_results = self.ner_pipeline(text)
-            for entity in ner_results:
-                if entity['entity_group'] in ['PER', 'ORG'] and entity['score'] > 0.5:
-                    protected_ranges.append(range(entity['start'], entity['end']))
-
-        tokens = []
-        for match in re.finditer(r'\S+', text): 
-            tokens.append((match.group(), match.start(), match.end()))
-        
-        fixed_text_parts = []
-        last_end = 0
-
-        for word, start, end in tokens:
-            fixed_text_parts.append(text[last_end:start])
-            
-            is_protected = False
-            token_range = range(start, end)
-            for r in protected_ranges:
-                if set(token_range).intersection(set(r)):
-                    is_protected = True; break
-            
-            if is_protected:
-                fixed_text_parts.append(word); last_end = end; continue
-
-            clean_word = re.sub(r'[^\w\-]', '', word) 
-            
-            if not clean_word or any(c.isdigit() for c in clean_word):
-                fixed_text_parts.append(word); last_end = end; continue
-            
-            if self.sym_spell.lookup(clean_word.lower(), Verbosity.TOP, max_edit_distance=0):
-                fixed_text_parts.append(word); last_end = end; continue
-            
-            if '-' in clean_word:
-                parts = clean_word.split('-')
-                is_valid_reduplication = True
-                for part in parts:
-                    if not part: continue
-                    if not self.sym_spell.lookup(part.lower(), Verbosity.TOP, max_edit_distance=0):
-                        is_valid_reduplication = False; break
-                if is_valid_reduplication:
-                    fixed_text_parts.append(word); last_end = end; continue
-
-            suggestions = self.sym_spell.lookup(clean_word.lower(), Verbosity.CLOSEST, max_edit_distance=2)
-            if suggestions:
-                best = suggestions[0].term
-                if len(clean_word) < 4 and len(best) != len(clean_word): 
-                    fixed_text_parts.append(word)
-                else:
-                    fixed = best.title() if word[0].isupper() else best
-                    if not word[-1].isalnum(): fixed += word[-1]
-                    self.log_change("Spelling", word, fixed)
-                    fixed_text_parts.append(fixed)
-            else: 
-                fixed_text_parts.append(word)
-            
-            last_end = end
-            
-        fixed_text_parts.append(text[last_end:])
-        return "".join(fixed_text_parts)
-
-    def fix_numbers_eyd(self, text):
-        def is_part_of_list(full_text, start, end):
-            window = full_text[max(0, start-20):min(len(full_text), end+20)]
-            return ',' in window and ('dan' in window or re.search(r'\d', window))
-        def num_replacer(match):
+            return verify_artifact(path)
+        except DictionaryArtifactError as e:
+            raise DictionaryArtifactError(f"No valid dictionary artifact: {e}. Build it with: python -m scripts.build_dictionary") from e
+
+    def _load_symspell_index(self, path, manifest):
+        # Snapshot biner dipakai jika masih cocok dengan hash kamus dan parameter
+        load_symspell(self.sym_spell, path, SYMSPELL_MAX_EDIT_DISTANCE, SYMSPELL_PREFIX_LENGTH,
+                      content_sha256=manifest["output_sha256"])
+        # Cache keputusan ejaan dikosongkan jika kamus berubah
+        self.dictionary_version = f"{self.dictionary_mode}:{manifest['output_sha256']}:{manifest['roots_sha256']}"
+        SPELLING_CACHE.bind(self.dictionary_version)
+
+    def _is_known_word(self, word):
+        started = time.perf_counter()
+        if self.morph_validator: known = self.morph_validator.is_valid(word)
+        else: known = bool(self.sym_spell.lookup(word, Verbosity.TOP, max_edit_distance=0))
+        SYMSPELL_LOOKUP_SECONDS.observe(time.perf_counter() - started, "exact")
+        return known
+
+    def _spelling_decision(self, word):
+        """
+        Keputusan ejaan untuk token bersih (huruf kecil): (jenis, saran terbaik).
+        Hasilnya di-memo di SPELLING_CACHE lintas token dan lintas request.
+        """
+        key = (self.dictionary_version, word)
+        decision = SPELLING_CACHE.get(key)
+        if decision is not None: return decision
+
+        if self._is_known_word(word):
+            decision = (SPELLING_VALID, None)
+        elif '-' in word and all(self._is_known_word(part) for part in word.split('-') if part):
+            decision = (SPELLING_REDUPLICATION, None)
+        else:
+            started = time.perf_counter()
+            suggestions = self.sym_spell.lookup(word, Verbosity.CLOSEST, max_edit_distance=2)
+            SYMSPELL_LOOKUP_SECONDS.observe(time.perf_counter() - started, "fuzzy")
+            decision = (SPELLING_SUGGESTION, suggestions[0].term) if suggestions else (SPELLING_UNKNOWN, None)
+        SPELLING_CACHE.put(key, decision)
+        return decision
+
+    def _split_sentences(self, text):
+        """Memecah teks menjadi span (start, end) berukuran kalimat untuk job NER."""
+        spans = []
+        for match in SENTENCE_PATTERN.finditer(text):
+            start, end = match.start(), match.end()
+            while end - start > NER_MAX_CHARS:
+                cut = text.rfind(' ', start + 1, start + NER_MAX_CHARS)
+                if cut == -1: cut = start + NER_MAX_CHARS
+                spans.append((start, cut))
+                start = cut
+            if text[start:end].strip(): spans.append((start, end))
+        return spans
+
+    def _needs_ner(self, sentence):
+        """
+        Gate NER: kalimat perlu NER jika memuat token yang tidak dikenal kamus,
+        huruf kapital di tengah kalimat (kasus ambigu), atau nama tempat ambigu.
+        """
+        function_words = self.gazetteer.function_words if self.gazetteer else ()
+        for n, word in enumerate(sentence.split()):
+            clean_word = word if word.isalpha() else NON_WORD_CHARS.sub('', word)
+            if not clean_word or DIGIT_PATTERN.search(clean_word): continue
+            if n and not clean_word.islower(): return True
+            key = clean_word.lower()
+            if key in function_words: continue
+            if self._spelling_decision(key)[0] not in (SPELLING_VALID, SPELLING_REDUPLICATION): return True
+        return bool(self.gazetteer) and any(ambiguous for *_, ambiguous in self.gazetteer.find(sentence))
+
+    def ner_gate_stats(self):
+        with self._gate_lock:
+            return {
+                "enabled": self.ner_gate,
+                "sentences": self._gate_sentences,
+                "skipped": self._gate_skipped,
+                "skip_rate": self._gate_skipped / self._gate_sentences if self._gate_sentences else 0.0,
+            }
+
+    def _find_entities(self, texts):
+        """Entitas hasil NER ditambah frasa gazetteer yang tidak tumpang tindih dengan span NER."""
+        entities = self._run_ner_batch(texts)
+        if not self.gazetteer: return entities
+        for text, found in zip(texts, entities):
+            places = self.gazetteer.find(text)
+            if not places: continue
+            spans = SpanIndex((entity['start'], entity['end']) for entity in found)
+            for start, end, label, ambiguous in places:
+                if ambiguous or (spans and spans.overlaps(start, end)): continue
+                found.append({'entity_group': label, 'score': 1.0, 'word': text[start:end], 'start': start, 'end': end})
+            found.sort(key=lambda entity: entity['start'])
+        return entities
+
+    def _run_ner_batch(self, texts):
+        """
+        NER untuk banyak teks sekaligus. Kalimat dari seluruh teks diurutkan
+        berdasarkan panjang sebelum dikirim ke NerBatcher, sehingga setiap batch
+        berisi kalimat dengan panjang serupa dan padding-nya minimal.
+        Jika gate aktif, kalimat yang tidak memerlukan NER dilewati.
+        """
+        entities = [[] for _ in texts]
+        if not self.ner_pipeline: return entities
+        jobs = []
+        sentences, skipped = 0, 0
+        for index, text in enumerate(texts):
+            for start, end in self._split_sentences(text):
+                sentence = text[start:end]
+                sentences += 1
+                if self.ner_gate and not self._needs_ner(sentence):
+                    skipped += 1
+                    continue
+                jobs.append((index, start, sentence))
+        with self._gate_lock:
+            self._gate_sentences += sentences
+            self._gate_skipped += skipped
+        if not jobs: return entities
+
+        if len(jobs) > 1: jobs.sort(key=lambda job: len(job[2]))
+        sentences = [sentence for _, _, sentence in jobs]
+        if self.ner_batcher: outputs = self.ner_batcher.submit(sentences)
+        else: outputs = [self.ner_pipeline(sentence) for sentence in sentences]
+        for (index, offset, _), output in zip(jobs, outputs):
+            for entity in output:
+                entities[index].append({**entity, 'start': entity['start'] + offset, 'end': entity['end'] + offset})
+        if len(jobs) > 1:
+            for found in entities: found.sort(key=lambda entity: entity['start'])
+        return entities
+
+    # CORRECTION PIPELINE (public stage: satu stage pada teks lepas)
+    def _apply_stage(self, stage, text, ctx, *args):
+        ctx = ctx or CorrectionContext()
+        return stage(TokenArray.tokenize(text), *args, ctx).materialize()
+
+    def fix_punctuation_spacing(self, text, ctx=None):
+        return self._apply_stage(self._punctuation_pass, text, ctx)
+
+    def fix_reduplication(self, text, ctx=None):
+        return self._apply_stage(self._reduplication_pass, text, ctx)
+
+    def fix_kpst_correction_pre(self, text, ctx=None):
+        return self._apply_stage(self._kpst_pass, text, ctx)
+
+    def fix_spelling_advanced(self, text, entities=None, ctx=None):
+        if entities is None: entities = self._find_entities([text])[0]
+        return self._apply_stage(self._spelling_pass, text, ctx, entities)
+
+    def fix_numbers_eyd(self, text, ctx=None):
+        return self._apply_stage(self._numbers_pass, text, ctx)
+
+    def fix_capitalization_ner(self, text, entities=None, ctx=None):
+        if not self.ner_pipeline: return text
+        if entities is None: entities = self._find_entities([text])[0]
+        return self._apply_stage(self._capitalization_pass, text, ctx, entities)
+
+    # TOKEN PASSES
+    # Setiap pass berjalan linear di atas TokenArray. Offset start/end token
+    # tetap dalam koordinat teks input; edit yang mengubah panjang teks dicatat
+    # ke journal (koordinat teks sebelum pass) untuk memetakan span entitas.
+    def _punctuation_pass(self, tokens, ctx):
+        journal = ctx.journal
+        journal.begin_stage()
+        gaps = tokens.gaps
+        merged = []
+        # Pass pertama: gap token masih sama dengan teks input
+        for i in [i for i, flag in enumerate(tokens.flags) if flag & (FLAG_PUNCT | FLAG_GLUED)]:
+            gap = gaps[i]
+            if tokens.flags[i] & FLAG_GLUED: gaps[i] = " "
+            elif gap: gaps[i] = ""
+            else: continue
+            journal.record(tokens.starts[i] - len(gap), tokens.starts[i], len(gaps[i]))
+            if i and not gaps[i]: merged.append(i)
+        journal.end_stage()
+        return tokens.absorb(merged) if merged else tokens
+
+    def _reduplication_pass(self, tokens, ctx):
+        """
+        Kandidat dicari dengan satu scan regex pada teks input: pass tanda baca
+        hanya menghapus spasi sebelum tanda baca dan menyisipkan spasi setelahnya,
+        sehingga tidak mengubah pasangan "kata kata". Tidak ada perubahan
+        panjang teks, jadi tidak ada yang dicatat ke journal.
+        """
+        words, gaps = tokens.words, tokens.gaps
+        merged = []
+        owner = {}
+        for match in REDUPLICATION_PATTERN.finditer(tokens.source):
+            second = bisect_left(tokens.starts, match.start(2))
+            first = owner.get(second - 1, second - 1)
+            group, repeated = match.group(1), match.group(2)
+            fixed = f"{group}-{group}"
+            ctx.log_change("Reduplication", match.group(0), fixed)
+            words[first] = words[first][:-len(group)] + fixed + words[second][len(repeated):]
+            words[second] = gaps[second] = ""
+            owner[second] = first
+            merged.append(second)
+        return tokens.absorb(merged) if merged else tokens
+
+    def _kpst_pass(self, tokens, ctx):
+        # Kandidat (awalan me- yang diatur KPST_RULES atau "menpegang") dicari pada teks input
+        candidates = sorted({tokens.token_at(match.start()) for match in KPST_CANDIDATE.finditer(tokens.source)})
+        replacements = []
+        for i in candidates:
+            word = tokens.words[i]
+            fixed = self._fix_kpst_word(word, ctx)
+            if fixed != word:
+                replacements.append((i, fixed, [(0, len(word), len(fixed))] if len(fixed) != len(word) else []))
+        tokens.replace(replacements, ctx.journal)
+        return tokens
+
+    def _fix_kpst_word(self, word, ctx):
+        clean_word = word.lower()
+        for pattern, replacement in KPST_RULES:
+            if pattern.match(clean_word):
+                fixed = pattern.sub(replacement, clean_word, count=1); ctx.log_change("KPST Correction", word, fixed); return fixed
+        if 'menpegang' in clean_word:
+            fixed = clean_word.replace('menpegang', 'memegang'); ctx.log_change("KPST/Typo Correction", word, fixed); return fixed
+        return word
+
+    def _spelling_pass(self, tokens, entities, ctx):
+        protected_spans = SpanIndex(
+            (entity['start'], entity['end']) for entity in entities
+            if entity['entity_group'] in ['PER', 'ORG'] and entity['score'] > 0.5
+        )
+        # Token diproses dari kiri ke kanan, sehingga cukup satu sweep maju
+        protected = protected_spans.sweep() if protected_spans else None
+
+        # Memo per dokumen di depan SPELLING_CACHE untuk kata yang berulang
+        decisions = {}
+        replacements = []
+        for i, (word, start, end, flag) in enumerate(zip(tokens.words, tokens.starts, tokens.ends, tokens.flags)):
+            if flag & FLAG_DIGIT or (protected and protected.overlaps(start, end)): continue
+
+            clean_word = word if word.isalpha() else NON_WORD_CHARS.sub('', word)
+            if not clean_word or (not clean_word.isalpha() and any(c.isdigit() for c in clean_word)): continue
+
+            key = clean_word.lower()
+            decision = decisions.get(key)
+            if decision is None: decision = decisions[key] = self._spelling_decision(key)
+            kind, best = decision
+            if kind != SPELLING_SUGGESTION: continue
+            if len(clean_word) < 4 and len(best) != len(clean_word): continue
+
+            fixed = best.title() if word[0].isupper() else best
+            if not word[-1].isalnum(): fixed += word[-1]
+            ctx.log_change("Spelling", word, fixed)
+            replacements.append((i, fixed, [(0, len(word), len(fixed))] if len(fixed) != len(word) else []))
+        tokens.replace(replacements, ctx.journal)
+        return tokens
+
+    def _numbers_pass(self, tokens, ctx):
+        def num_replacer(i, match):
             num_str = match.group(0)
             clean = num_str.replace('.', '').replace(',', '')
             if not clean.isdigit(): return num_str
             num = int(clean)
             try:
                 words = num2words(num, lang='id')
-                if len(words.split()) == 1 and not is_part_of_list(text, match.start(), match.end()):
-                    self.log_change("Num to Word", num_str, words); return words
+                if len(words.split()) == 1 and not is_part_of_list(tokens.context(i, match.start(), match.end(), 20)):
+                    ctx.log_change("Num to Word", num_str, words); return words
             except: pass
             suffixes = {1000000000000: 'triliun', 1000000000: 'miliar', 1000000: 'juta', 1000: 'ribu'}
             for l, label in suffixes.items():
                 if num >= l and num % l == 0:
-                    res = f"{num // l} {label}"; self.log_change("Large Num", num_str, res); return res
+                    res = f"{num // l} {label}"; ctx.log_change("Large Num", num_str, res); return res
             return num_str
-        return re.sub(r'\b\d[\d.]*\b', num_replacer, text)
-
-    def fix_capitalization_ner(self, text):
-        if not self.ner_pipeline: return text
-        results = self.ner_pipeline(text)
-        text_chars = list(text)
-        results.sort(key=lambda x: x['start'], reverse=True)
-        allowed_tags = ['PER', 'ORG', 'LOC', 'GPE'] 
-        for entity in results:
+        def is_part_of_list(window):
+            return ',' in window and ('dan' in window or DIGIT_PATTERN.search(window))
+
+        # Konteks daftar dibaca dari teks sebelum stage ini, jadi hasil diterapkan setelah scan
+        replacements = []
+        for i in [i for i, flag in enumerate(tokens.flags) if flag & FLAG_DIGIT]:
+            word = tokens.words[i]
+            parts, edits, last_end = [], [], 0
+            for match in NUMBER_PATTERN.finditer(word):
+                replaced = num_replacer(i, match)
+                parts.append(word[last_end:match.start()])
+                parts.append(replaced)
+                if len(replaced) != len(match.group(0)): edits.append((match.start(), match.end(), len(replaced)))
+                last_end = match.end()
+            fixed = "".join(parts) + word[last_end:]
+            if fixed != word: replacements.append((i, fixed, edits))
+        tokens.replace(replacements, ctx.journal)
+        return tokens
+
+    def _capitalization_pass(self, tokens, entities, ctx, sentence_start=None):
+        """
+        Span entitas di sini sudah dalam koordinat teks terkini (dipetakan lewat journal).
+        sentence_start menentukan apakah token pertama berada di awal kalimat;
+        jika None, token pertama selalu dianggap awal kalimat (spasi di depannya diabaikan).
+        """
+        if not self.ner_pipeline: return tokens
+        words, gaps = tokens.words, tokens.gaps
+        # Pengecekan huruf kapital awal memakai teks sebelum stage ini
+        source_words = {}
+        allowed_tags = ['PER', 'ORG', 'LOC', 'GPE']
+        positions = tokens.positions() if entities else None
+        for entity in sorted(entities, key=lambda x: x['start'], reverse=True):
             label = entity['entity_group']
             score = entity['score']
-            if label in allowed_tags and score > 0.6: 
-                start, end = entity['start'], entity['end']
-                word = text[start:end]
+            if label in allowed_tags and score > 0.6:
+                pieces = tokens.locate(entity['start'], entity['end'], positions)
+                if not pieces: continue
+                word = "".join(
+                    (gaps[i] if n else "") + source_words.get(i, words[i])[start:end] for n, (i, start, end) in enumerate(pieces)
+                )
                 if word[0].isupper(): continue
                 fixed_word = word.title()
-                for i in range(len(fixed_word)): text_chars[start + i] = fixed_word[i]
-                self.log_change(f"Capitalization ({label})", word, fixed_word)
-        text = "".join(text_chars)
-        return re.sub(r'(^|[.!?]\s+)([a-z])', lambda m: m.group(1) + m.group(2).upper(), text)
-
-    def process(self, text):
-        self.changes_log = []
-        print("\n[INFO] Processing Text...")
-        text = self.fix_punctuation_spacing(text)
-        text = self.fix_reduplication(text)
-        text = self.fix_kpst_correction_pre(text)
-        text = self.fix_spelling_advanced(text) 
-        text = self.fix_numbers_eyd(text)
-        text = self.fix_capitalization_ner(text)
-        return text
\ No newline at end of file
+                pos = 0
+                for n, (i, start, end) in enumerate(pieces):
+                    if n: pos += len(gaps[i])
+                    source_words.setdefault(i, words[i])
+                    words[i] = words[i][:start] + fixed_word[pos:pos + end - start] + words[i][end:]
+                    pos += end - start
+                ctx.log_change(f"Capitalization ({label})", word, fixed_word)
+
+        # Huruf pertama teks dan setelah akhir kalimat ([.!?] + spasi) dijadikan kapital
+        sentence_starts = [i for i in range(1, len(words)) if words[i - 1][-1] in '.!?' and gaps[i]]
+        if words and sentence_start is not False: sentence_starts.insert(0, 0)
+        for i in sentence_starts:
+            word = words[i]
+            if 'a' <= word[0] <= 'z': words[i] = word[0].upper() + word[1:]
+        return tokens
+
+    def process(self, text, timings=False, sentence_start=None):
+        """
+        Menjalankan seluruh pipeline koreksi; aman dipanggil dari banyak thread.
+        Teks dipecah per paragraf dan setiap paragraf dicari di cache (memori,
+        lalu disk jika diaktifkan) berdasarkan hash konten. Hanya paragraf yang
+        berubah yang diproses ulang, sebagai satu batch.
+        timings=True mengisi result.timings dengan durasi per stage (ms).
+        sentence_start menentukan konteks paragraf pertama saat dokumen
+        dikoreksi per chunk (lihat paragraphs.next_sentence_start).
+        """
+        started = time.perf_counter()
+        sink = {} if timings else None
+        clock = StageClock(STAGE_SECONDS, sink)
+        separators, paragraphs, tail = split_paragraphs(text)
+        starts = sentence_starts(separators, paragraphs, sentence_start)
+        keys = [paragraph_key(paragraph, start) for paragraph, start in zip(paragraphs, starts)]
+
+        found = {}
+        for key in keys:
+            cached = PARAGRAPH_CACHE.get((self.cache_version, key))
+            if cached is not None: found[key] = cached
+        if self.paragraph_store:
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            if missing:
+                stored = self.paragraph_store.get_many(missing)
+                for key, (fixed, changes) in stored.items():
+                    found[key] = (fixed, changes)
+                    PARAGRAPH_CACHE.put((self.cache_version, key), found[key])
+        clock.lap("paragraph_cache")
+        clock.flush()
+
+        pending = {}
+        for key, paragraph, start in zip(keys, paragraphs, starts):
+            if key not in found: pending.setdefault(key, (paragraph, start))
+        if pending:
+            results = self._correct([paragraph for paragraph, _ in pending.values()],
+                                    [start for _, start in pending.values()], sink)
+            computed = {key: (result.text, result.changes) for key, result in zip(pending, results)}
+            for key, value in computed.items(): PARAGRAPH_CACHE.put((self.cache_version, key), value)
+            if self.paragraph_store: self.paragraph_store.put_many(computed)
+            found.update(computed)
+        logger.debug("Processed text: %d paragraphs, %d recomputed", len(paragraphs), len(pending))
+
+        # Log setiap paragraf diputar ulang sesuai urutan paragraf pada dokumen
+        parts, changes = [], []
+        for separator, key in zip(separators, keys):
+            fixed, paragraph_changes = found[key]
+            parts.append(separator)
+            parts.append(fixed)
+            changes.extend(paragraph_changes)
+        result = CorrectionResult(text="".join(parts) + tail, changes=changes)
+        self._record_documents([text], [result])
+        if timings:
+            result.timings = self._timings_block(started, sink, paragraphs=len(paragraphs), recomputed=len(pending))
+        return result
+
+    def process_batch(self, texts, timings=False):
+        """
+        Mengoreksi banyak teks sekaligus. Input identik hanya diproses sekali,
+        NER dijalankan sebagai batch untuk seluruh teks unik, dan setiap stage
+        dijalankan untuk seluruh batch sebelum stage berikutnya. Hasil
+        dikembalikan sesuai urutan input. timings=True mengisi result.timings
+        dengan durasi per stage untuk seluruh batch (sama untuk setiap hasil).
+        """
+        unique = list(dict.fromkeys(texts))
+        logger.debug("Processing batch: %d texts, %d unique", len(texts), len(unique))
+        started = time.perf_counter()
+        sink = {} if timings else None
+        results = dict(zip(unique, self._correct(unique, None, sink)))
+        ordered = [results[text] for text in texts]
+        self._record_documents(texts, ordered)
+        if timings:
+            block = self._timings_block(started, sink, texts=len(texts), unique=len(unique))
+            for result in results.values(): result.timings = block
+        return ordered
+
+    def _record_documents(self, texts, results):
+        DOCUMENT_CHARS.observe_many((len(text), ()) for text in texts)
+        counts = {}
+        for result in results:
+            for change in result.changes:
+                key = (change["Type"],)
+                counts[key] = counts.get(key, 0) + 1
+        if counts: CORRECTIONS_TOTAL.inc_many(counts)
+
+    def _timings_block(self, started, sink, **extra):
+        return {
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+            "stages_ms": {stage: round(ms, 3) for stage, ms in sink.items()},
+            **extra,
+        }
+
+    def _correct(self, texts, starts=None, sink=None):
+        """
+        Pipeline untuk sekumpulan teks. Setiap teks ditokenisasi sekali dan NER
+        dijalankan sekali pada teks input. Spelling mencocokkan span dengan
+        offset input token; kapitalisasi memakai span yang dipetakan lewat
+        journal ke teks terkini. Durasi setiap stage dicatat ke histogram
+        STAGE_SECONDS (dan ke sink jika diberikan).
+        """
+        if starts is None: starts = [None] * len(texts)
+        clock = StageClock(STAGE_SECONDS, sink)
+        contexts = [CorrectionContext() for _ in texts]
+        entities = self._find_entities(texts)
+        clock.lap("ner")
+        batch = [TokenArray.tokenize(text) for text in texts]
+        clock.lap("tokenize")
+        TOKENS_TOTAL.inc(amount=sum(map(len, batch)))
+        batch = [self._punctuation_pass(tokens, ctx) for tokens, ctx in zip(batch, contexts)]
+        clock.lap("punctuation")
+        batch = [self._reduplication_pass(tokens, ctx) for tokens, ctx in zip(batch, contexts)]
+        clock.lap("reduplication")
+        batch = [self._kpst_pass(tokens, ctx) for tokens, ctx in zip(batch, contexts)]
+        clock.lap("kpst")
+        batch = [self._spelling_pass(tokens, found, ctx) for tokens, ctx, found in zip(batch, contexts, entities)]
+        clock.lap("spelling")
+        batch = [self._numbers_pass(tokens, ctx) for tokens, ctx in zip(batch, contexts)]
+        clock.lap("numbers")
+        batch = [self._capitalization_pass(tokens, ctx.journal.map_entities(found), ctx, start)
+                 for tokens, ctx, found, start in zip(batch, contexts, entities, starts)]
+        clock.lap("capitalization")
+        results = [CorrectionResult(text=tokens.materialize(), changes=ctx.changes) for tokens, ctx in zip(batch, contexts)]
+        clock.lap("materialize")
+        clock.flush()
+        return results
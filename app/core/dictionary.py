@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.core.lexicon import get_extra_words
+from app.core.morphology import DICTIONARY_WORD_PATTERN, MORPHOLOGY_VERSION, MorphologyValidator, apply_morphology
+from app.core.snapshot import file_sha256
+
+# ARTIFACT LOCATIONS
+DATA_DIR = "data"
+ROOTS_FILENAME = os.path.join(DATA_DIR, "kata-dasar.txt")
+EXPANDED_DICT_FILENAME = os.path.join(DATA_DIR, "full_dictionary_v7_suffix_stacking.txt")
+ROOT_DICT_FILENAME = os.path.join(DATA_DIR, "root_dictionary.txt")
+FREQUENT_FORMS_FILENAME = os.path.join(DATA_DIR, "frequent_forms.txt")
+SHARD_DIR = os.path.join(DATA_DIR, "build")
+
+MANIFEST_FORMAT_VERSION = 1
+DEFAULT_SHARDS = 64
+
+
+class DictionaryArtifactError(RuntimeError):
+    """Artefak kamus tidak ada, rusak, atau tidak cocok dengan input saat ini."""
+
+
+# HELPERS
+def manifest_path_for(artifact_path):
+    return artifact_path + ".manifest.json"
+
+
+def text_sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def read_roots(roots_path):
+    with open(roots_path, encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+
+def extras_sha256():
+    return text_sha256("\n".join(sorted(get_extra_words())))
+
+
+def atomic_write_lines(path, lines):
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(path, data):
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_manifest(artifact_path):
+    path = manifest_path_for(artifact_path)
+    if not os.path.exists(path): return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def shard_of(root, shards):
+    return zlib.crc32(root.encode("utf-8")) % shards
+
+
+# PARALLEL EXPANSION
+def _expand_shard(roots):
+    """Dijalankan di worker process: ekspansi morfologi satu shard kata dasar."""
+    forms = set()
+    for root in roots: forms.update(apply_morphology(root))
+    return sorted(word for word in forms if DICTIONARY_WORD_PATTERN.match(word))
+
+
+def _shard_path(shard_dir, index):
+    return os.path.join(shard_dir, f"shard_{index:03d}.txt")
+
+
+def build_expanded_dictionary(roots_path=ROOTS_FILENAME, output_path=EXPANDED_DICT_FILENAME,
+                              shard_dir=SHARD_DIR, workers=None, shards=DEFAULT_SHARDS, force=False):
+    """
+    Membangun kamus ekspansi penuh secara paralel dan inkremental.
+    Kata dasar dibagi ke shard berdasarkan hash; hanya shard yang isinya
+    berubah (atau versi morfologinya berbeda) yang diekspansi ulang.
+    Output dan manifest ditulis secara atomik.
+    """
+    started = time.perf_counter()
+    roots = read_roots(roots_path)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    shard_roots = [[] for _ in range(shards)]
+    for root in roots: shard_roots[shard_of(root, shards)].append(root)
+    shard_inputs = [text_sha256(MORPHOLOGY_VERSION + "\n" + "\n".join(sorted(rs))) for rs in shard_roots]
+
+    previous = load_manifest(output_path) or {}
+    previous_shards = previous.get("shards", []) if previous.get("shard_count") == shards else []
+    stale = []
+    for index, input_hash in enumerate(shard_inputs):
+        reusable = (
+            not force
+            and index < len(previous_shards)
+            and previous_shards[index] == input_hash
+            and os.path.exists(_shard_path(shard_dir, index))
+        )
+        if not reusable: stale.append(index)
+
+    print(f"    {len(roots)} root words in {shards} shards, {len(stale)} shard(s) to regenerate")
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_expand_shard, shard_roots[index]): index for index in stale}
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                atomic_write_lines(_shard_path(shard_dir, index), future.result())
+                if done % 8 == 0 or done == len(stale): print(f"    ... {done}/{len(stale)} shards generated")
+
+    final_dictionary = set(word for word in get_extra_words() if DICTIONARY_WORD_PATTERN.match(word))
+    for index in range(shards):
+        with open(_shard_path(shard_dir, index), encoding="utf-8") as f:
+            final_dictionary.update(line.rstrip("\n") for line in f if line.strip())
+
+    print(f"    Saving {len(final_dictionary)} words to {output_path}...")
+    atomic_write_lines(output_path, (f"{word} 1" for word in sorted(final_dictionary)))
+    atomic_write_json(manifest_path_for(output_path), {
+        "format": MANIFEST_FORMAT_VERSION,
+        "kind": "expanded",
+        "morphology_version": MORPHOLOGY_VERSION,
+        "roots_path": roots_path,
+        "roots_sha256": file_sha256(roots_path),
+        "extras_sha256": extras_sha256(),
+        "shard_count": shards,
+        "shards": shard_inputs,
+        "word_count": len(final_dictionary),
+        "output_sha256": file_sha256(output_path),
+    })
+    print(f"    Expanded dictionary built in {time.perf_counter() - started:.1f}s")
+    return output_path
+
+
+def build_root_dictionary(roots_path=ROOTS_FILENAME, output_path=ROOT_DICT_FILENAME,
+                          frequent_forms_path=FREQUENT_FORMS_FILENAME):
+    """
+    Membangun indeks mode "roots": kata dasar, kata tambahan, dan bentuk
+    turunan yang sering muncul (opsional) yang lolos MorphologyValidator.
+    """
+    roots = read_roots(roots_path)
+    validator = MorphologyValidator(roots, get_extra_words())
+
+    entries = {word: 1 for word in roots if DICTIONARY_WORD_PATTERN.match(word)}
+    entries.update((word, 1) for word in validator.extras)
+    frequent_sha256 = None
+    if os.path.exists(frequent_forms_path):
+        frequent_sha256 = file_sha256(frequent_forms_path)
+        with open(frequent_forms_path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if not parts or not validator.is_valid(parts[0].lower()): continue
+                entries[parts[0].lower()] = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+
+    atomic_write_lines(output_path, (f"{word} {count}" for word, count in sorted(entries.items())))
+    atomic_write_json(manifest_path_for(output_path), {
+        "format": MANIFEST_FORMAT_VERSION,
+        "kind": "roots",
+        "morphology_version": MORPHOLOGY_VERSION,
+        "roots_path": roots_path,
+        "roots_sha256": file_sha256(roots_path),
+        "extras_sha256": extras_sha256(),
+        "frequent_forms_sha256": frequent_sha256,
+        "word_count": len(entries),
+        "output_sha256": file_sha256(output_path),
+    })
+    print(f"    Indexed {len(entries)} roots and frequent forms to {output_path}")
+    return output_path
+
+
+# ARTIFACT VALIDATION
+def verify_artifact(artifact_path):
+    """
+    Memastikan artefak kamus siap dipakai server. Melempar DictionaryArtifactError
+    jika artefak atau manifest tidak ada, isi file tidak cocok dengan manifest,
+    atau artefak dibangun dengan versi morfologi/gazetteer yang berbeda.
+    """
+    if not os.path.exists(artifact_path):
+        raise DictionaryArtifactError(f"{artifact_path} does not exist")
+    manifest = load_manifest(artifact_path)
+    if manifest is None or manifest.get("format") != MANIFEST_FORMAT_VERSION:
+        raise DictionaryArtifactError(f"{manifest_path_for(artifact_path)} is missing or unreadable")
+    if manifest.get("morphology_version") != MORPHOLOGY_VERSION:
+        raise DictionaryArtifactError(f"{artifact_path} was built with morphology {manifest.get('morphology_version')}")
+    if manifest.get("extras_sha256") != extras_sha256():
+        raise DictionaryArtifactError(f"{artifact_path} was built with different gazetteers")
+    if file_sha256(artifact_path) != manifest.get("output_sha256"):
+        raise DictionaryArtifactError(f"{artifact_path} does not match its manifest")
+    return manifest
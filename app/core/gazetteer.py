@@ -0,0 +1,85 @@
+import re
+from collections import deque
+
+from app.core.lexicon import (
+    AMBIGUOUS_PLACE_NAMES, EXTRA_PLACE_NAMES, get_common_particles, get_manual_cities, get_provinces_and_islands,
+)
+
+# Kata gazetteer: huruf saja, dibatasi batas kata (mis. "jakarta2" tidak cocok)
+GAZETTEER_WORD = re.compile(r'\b[A-Za-z]+\b')
+
+
+class Gazetteer:
+    """
+    Automaton Aho-Corasick di level kata untuk frasa gazetteer multi-kata
+    (mis. "papua pegunungan", "jakarta selatan"). Satu scan linear per teks;
+    frasa hanya cocok jika kata-katanya dipisah spasi tanpa baris baru.
+    Hasil dipilih leftmost-longest tanpa tumpang tindih.
+    """
+
+    def __init__(self, phrases, ambiguous=(), function_words=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [()]
+        ambiguous = set(ambiguous)
+        for phrase, label in phrases:
+            self._add(phrase.split(), (label, phrase in ambiguous))
+        self._build()
+        self.function_words = frozenset(function_words)
+
+    def _add(self, words, payload):
+        state = 0
+        for word in words:
+            if word not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+                self._goto[state][word] = len(self._goto) - 1
+            state = self._goto[state][word]
+        self._outputs[state] = ((len(words), *payload),)
+
+    def _build(self):
+        # Failure link dihitung BFS (anak root gagal ke root); output state mewarisi output failure-nya
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]: fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._outputs[child] += self._outputs[self._fail[child]]
+
+    def find(self, text):
+        """Daftar (start, end, label, ambiguous) frasa yang ditemukan pada text."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        spans = []
+        words = []
+        state, previous_end = 0, None
+        for match in GAZETTEER_WORD.finditer(text):
+            start, end = match.span()
+            if previous_end is not None:
+                gap = text[previous_end:start]
+                if not gap.isspace() or '\n' in gap: state = 0
+            previous_end = end
+            words.append(start)
+            word = match.group().lower()
+            while state and word not in goto[state]: state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, label, ambiguous in outputs[state]:
+                spans.append((words[-length], end, label, ambiguous))
+        if not spans: return spans
+
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        selected, last_end = [], -1
+        for span in spans:
+            if span[0] >= last_end:
+                selected.append(span)
+                last_end = span[1]
+        return selected
+
+
+def build_gazetteer():
+    """Gazetteer LOC dari daftar kota, provinsi, dan pulau; partikel sebagai kata fungsi."""
+    places = dict.fromkeys(get_manual_cities() + get_provinces_and_islands() + EXTRA_PLACE_NAMES)
+    return Gazetteer(((place, 'LOC') for place in places), AMBIGUOUS_PLACE_NAMES, get_common_particles())
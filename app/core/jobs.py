@@ -0,0 +1,467 @@
+import fcntl
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from io import BytesIO
+
+from app.core.cache import connect_sqlite, retry_locked
+from app.core.corrector import AdvancedCorrector
+from app.core.dictionary import DATA_DIR
+from app.core.paragraphs import next_sentence_start
+from app.utils.parsers import iter_chunks
+
+# Status job: queued -> parsing -> running -> done | failed | cancelled
+JOB_QUEUED = "queued"
+JOB_PARSING = "parsing"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_FINISHED = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Status chunk: pending -> running -> done | failed | cancelled
+CHUNK_PENDING = "pending"
+CHUNK_RUNNING = "running"
+CHUNK_DONE = "done"
+CHUNK_FAILED = "failed"
+CHUNK_CANCELLED = "cancelled"
+
+JOBS_FILENAME = os.path.join(DATA_DIR, "jobs.sqlite3")
+
+# Jeda polling worker ketika antrean kosong (detik)
+JOB_POLL_INTERVAL = 0.5
+
+
+class JobNotFound(Exception):
+    """Job dengan id tersebut tidak ada (atau sudah dihapus oleh retensi)."""
+
+
+class JobStore:
+    """
+    Antrean job koreksi dokumen di SQLite, dipakai bersama oleh proses API dan
+    proses worker. Dokumen dipecah menjadi chunk (halaman PDF / kelompok
+    paragraf) yang masing-masing bisa diambil worker mana pun, sehingga satu
+    dokumen dikerjakan beberapa worker sekaligus. Pengambilan pekerjaan memakai
+    BEGIN IMMEDIATE agar satu chunk tidak pernah diambil dua worker.
+    """
+
+    def __init__(self, path=JOBS_FILENAME):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = connect_sqlite(path, isolation_level=None)
+        self._lock = threading.Lock()
+        retry_locked(self._conn.execute, "PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, filename TEXT NOT NULL, status TEXT NOT NULL,"
+                " content BLOB, error TEXT, worker INTEGER, total_chunks INTEGER,"
+                " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks (job_id TEXT NOT NULL, idx INTEGER NOT NULL, status TEXT NOT NULL,"
+                " original TEXT NOT NULL, sep TEXT NOT NULL, sentence_start INTEGER, corrected TEXT, logs TEXT,"
+                " error TEXT, worker INTEGER, started_at REAL, finished_at REAL, PRIMARY KEY (job_id, idx))"
+            )
+            # Basis data lama: chunk tanpa pemisah digabung dengan "\n" seperti sebelumnya
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(chunks)")}
+            if "sep" not in columns: conn.execute("ALTER TABLE chunks ADD COLUMN sep TEXT NOT NULL DEFAULT '\n'")
+            if "sentence_start" not in columns: conn.execute("ALTER TABLE chunks ADD COLUMN sentence_start INTEGER")
+            conn.execute("CREATE INDEX IF NOT EXISTS chunks_status ON chunks (status, job_id, idx)")
+
+    @contextmanager
+    def _transaction(self):
+        # Kunci tulis diambil di BEGIN IMMEDIATE, sehingga hanya BEGIN dan COMMIT yang bisa
+        # gagal karena basis data terkunci; keduanya aman diulang tanpa menjalankan ulang isi transaksi
+        with self._lock:
+            retry_locked(self._conn.execute, "BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                retry_locked(self._conn.execute, "COMMIT")
+            except BaseException:
+                if self._conn.in_transaction: self._conn.execute("ROLLBACK")
+                raise
+
+    # API
+    def submit(self, filename, content):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, filename, status, content, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, filename, JOB_QUEUED, content, now, now),
+            )
+        return job_id
+
+    def cancel(self, job_id):
+        """Membatalkan job yang belum selesai; chunk yang sedang berjalan hasilnya dibuang."""
+        with self._transaction() as conn:
+            status = self._job_status(conn, job_id)
+            if status not in JOB_FINISHED:
+                self._finish_job(conn, job_id, JOB_CANCELLED)
+                status = JOB_CANCELLED
+        return status
+
+    def status(self, job_id):
+        """Status job beserta progres setiap chunk."""
+        with self._lock:
+            job = self._job_row(job_id)
+            rows = self._conn.execute(
+                "SELECT idx, status, length(original), worker, started_at, finished_at, error FROM chunks"
+                " WHERE job_id = ? ORDER BY idx", (job_id,),
+            ).fetchall()
+        chunks = [
+            {
+                "index": idx, "status": status, "chars": chars, "worker": worker,
+                "ms": round((finished - started) * 1000, 3) if started and finished else None,
+                "error": error,
+            }
+            for idx, status, chars, worker, started, finished, error in rows
+        ]
+        done = sum(chunk["status"] == CHUNK_DONE for chunk in chunks)
+        total = job["total_chunks"]
+        return {
+            **job,
+            "progress": {"done": done, "total": total, "fraction": done / total if total else 0.0},
+            "chunks": chunks,
+        }
+
+    def result(self, job_id):
+        """Hasil job (status, chunk terkoreksi, pemisah dan log per chunk); chunk kosong jika job belum selesai."""
+        with self._lock:
+            job = self._job_row(job_id)
+            rows = []
+            if job["status"] == JOB_DONE:
+                rows = self._conn.execute(
+                    "SELECT idx, original, sep, corrected, logs FROM chunks WHERE job_id = ? ORDER BY idx", (job_id,),
+                ).fetchall()
+        return job, [
+            {"index": idx, "original": original, "sep": sep, "corrected": corrected, "logs": json.loads(logs)}
+            for idx, original, sep, corrected, logs in rows
+        ]
+
+    def counts(self):
+        with self._lock:
+            jobs = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            chunks = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM chunks WHERE status IN (?, ?) GROUP BY status",
+                (CHUNK_PENDING, CHUNK_RUNNING),
+            ).fetchall())
+        return {"jobs": jobs, "chunks": chunks}
+
+    # WORKER
+    def claim_chunk(self, worker):
+        """
+        Mengambil chunk pending tertua dari job yang sedang berjalan:
+        (job_id, idx, teks, sentence_start) atau None.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT c.job_id, c.idx, c.original, c.sentence_start FROM chunks c JOIN jobs j ON j.id = c.job_id"
+                " WHERE c.status = ? AND j.status = ? ORDER BY j.created_at, c.idx LIMIT 1",
+                (CHUNK_PENDING, JOB_RUNNING),
+            ).fetchone()
+            if row is None: return None
+            conn.execute(
+                "UPDATE chunks SET status = ?, worker = ?, started_at = ? WHERE job_id = ? AND idx = ?",
+                (CHUNK_RUNNING, worker, time.time(), row[0], row[1]),
+            )
+        job_id, idx, text, start = row
+        return job_id, idx, text, None if start is None else bool(start)
+
+    def claim_parse(self, worker):
+        """Mengambil job baru untuk diparsing: (job_id, filename, content) atau None."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, filename, content FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (JOB_QUEUED,),
+            ).fetchone()
+            if row is None: return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, updated_at = ? WHERE id = ?",
+                (JOB_PARSING, worker, time.time(), row[0]),
+            )
+        return row
+
+    def add_chunks(self, job_id, chunks, worker):
+        """
+        Menyimpan hasil parsing berupa chunk (text, sep); job mulai berjalan
+        (atau gagal jika dokumen kosong). Konteks awal kalimat setiap chunk
+        dihitung di sini karena chunk dikerjakan worker yang berbeda-beda.
+        """
+        rows, start = [], None
+        for idx, (text, sep) in enumerate(chunks):
+            rows.append((job_id, idx, CHUNK_PENDING, text, sep, start))
+            start = next_sentence_start(text, sep, start)
+        with self._transaction() as conn:
+            # Job bisa dibatalkan (atau diambil ulang setelah restart) selama parsing
+            if not self._owns(conn, "jobs", "id = ?", (job_id,), JOB_PARSING, worker): return
+            if not any(text.strip() for text, _ in chunks):
+                self._finish_job(conn, job_id, JOB_FAILED, "File is empty or could not be read.")
+                return
+            conn.executemany(
+                "INSERT INTO chunks (job_id, idx, status, original, sep, sentence_start) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, content = NULL, worker = NULL, total_chunks = ?, updated_at = ?"
+                " WHERE id = ?", (JOB_RUNNING, len(chunks), time.time(), job_id),
+            )
+
+    def fail_parse(self, job_id, error, worker):
+        with self._transaction() as conn:
+            if self._owns(conn, "jobs", "id = ?", (job_id,), JOB_PARSING, worker):
+                self._finish_job(conn, job_id, JOB_FAILED, error)
+
+    def finish_chunk(self, job_id, idx, corrected, logs, worker):
+        """Menyimpan hasil satu chunk; job selesai jika semua chunknya selesai."""
+        with self._transaction() as conn:
+            if not self._owns(conn, "chunks", "job_id = ? AND idx = ?", (job_id, idx), CHUNK_RUNNING, worker): return
+            conn.execute(
+                "UPDATE chunks SET status = ?, corrected = ?, logs = ?, finished_at = ? WHERE job_id = ? AND idx = ?",
+                (CHUNK_DONE, corrected, json.dumps(logs, ensure_ascii=False), time.time(), job_id, idx),
+            )
+            (remaining,) = conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE job_id = ? AND status != ?", (job_id, CHUNK_DONE),
+            ).fetchone()
+            if remaining == 0 and self._job_status(conn, job_id) == JOB_RUNNING:
+                self._finish_job(conn, job_id, JOB_DONE)
+
+    def fail_chunk(self, job_id, idx, error, worker):
+        """Satu chunk gagal: job gagal dan chunk lain yang belum dikerjakan dibatalkan."""
+        with self._transaction() as conn:
+            if not self._owns(conn, "chunks", "job_id = ? AND idx = ?", (job_id, idx), CHUNK_RUNNING, worker): return
+            conn.execute(
+                "UPDATE chunks SET status = ?, error = ?, finished_at = ? WHERE job_id = ? AND idx = ?",
+                (CHUNK_FAILED, error, time.time(), job_id, idx),
+            )
+            if self._job_status(conn, job_id) == JOB_RUNNING:
+                self._finish_job(conn, job_id, JOB_FAILED, f"Chunk {idx}: {error}")
+
+    # RECOVERY
+    def requeue(self, workers=None):
+        """
+        Mengembalikan pekerjaan yang sedang berjalan ke antrean: semua (saat
+        startup, setelah server berhenti) atau milik worker tertentu yang mati.
+        """
+        where, params = "", ()
+        if workers is not None:
+            workers = list(workers)
+            if not workers: return 0
+            where, params = f" AND worker IN ({','.join('?' * len(workers))})", tuple(workers)
+        with self._transaction() as conn:
+            chunks = conn.execute(
+                f"UPDATE chunks SET status = ?, worker = NULL, started_at = NULL WHERE status = ?{where}",
+                (CHUNK_PENDING, CHUNK_RUNNING, *params),
+            ).rowcount
+            jobs = conn.execute(
+                f"UPDATE jobs SET status = ?, worker = NULL WHERE status = ?{where}",
+                (JOB_QUEUED, JOB_PARSING, *params),
+            ).rowcount
+        return chunks + jobs
+
+    def purge(self, older_than):
+        """Menghapus job yang sudah selesai lebih dari older_than detik yang lalu."""
+        cutoff = time.time() - older_than
+        with self._transaction() as conn:
+            finished = ",".join("?" * len(JOB_FINISHED))
+            conn.execute(
+                f"DELETE FROM chunks WHERE job_id IN (SELECT id FROM jobs WHERE status IN ({finished}) AND updated_at < ?)",
+                (*JOB_FINISHED, cutoff),
+            )
+            return conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({finished}) AND updated_at < ?", (*JOB_FINISHED, cutoff),
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # HELPERS
+    def _job_row(self, job_id):
+        row = self._conn.execute(
+            "SELECT id, filename, status, error, total_chunks, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None: raise JobNotFound(job_id)
+        return dict(zip(("id", "filename", "status", "error", "total_chunks", "created_at", "updated_at"), row))
+
+    def _job_status(self, conn, job_id):
+        row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None: raise JobNotFound(job_id)
+        return row[0]
+
+    def _owns(self, conn, table, where, params, status, worker):
+        row = conn.execute(f"SELECT status, worker FROM {table} WHERE {where}", params).fetchone()
+        return row is not None and row[0] == status and row[1] == worker
+
+    def _finish_job(self, conn, job_id, status, error=None):
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, content = NULL, worker = NULL, updated_at = ? WHERE id = ?",
+            (status, error, time.time(), job_id),
+        )
+        if status != JOB_DONE:
+            conn.execute(
+                "UPDATE chunks SET status = ? WHERE job_id = ? AND status IN (?, ?)",
+                (CHUNK_CANCELLED, job_id, CHUNK_PENDING, CHUNK_RUNNING),
+            )
+
+
+# WORKER PROCESS
+def worker_main(path, corrector_kwargs, stop_event, poll_interval=JOB_POLL_INTERVAL, parent=None):
+    """
+    Loop satu proses worker: AdvancedCorrector dimuat sekali, lalu chunk dan
+    job baru diambil dari JobStore sampai stop_event di-set atau proses pool
+    (parent) mati. Chunk didahulukan agar job yang lebih lama selesai lebih dulu.
+    """
+    worker = os.getpid()
+    store = JobStore(path)
+    corrector = AdvancedCorrector(**corrector_kwargs)
+    print(f"[jobs] Worker {worker} ready.")
+    # Worker yatim berhenti sendiri: pool baru akan mengembalikan chunk miliknya ke antrean
+    while not stop_event.is_set() and (parent is None or os.getppid() == parent):
+        chunk = store.claim_chunk(worker)
+        if chunk is not None:
+            job_id, idx, text, start = chunk
+            try:
+                result = corrector.process(text, sentence_start=start)
+            except Exception as e:
+                store.fail_chunk(job_id, idx, f"Correction error: {e}", worker)
+            else:
+                store.finish_chunk(job_id, idx, result.text, result.changes, worker)
+            continue
+
+        job = store.claim_parse(worker)
+        if job is not None:
+            job_id, filename, content = job
+            try:
+                chunks = list(iter_chunks(filename.lower(), BytesIO(content)))
+            except Exception as e:
+                store.fail_parse(job_id, f"File parsing error: {e}", worker)
+            else:
+                store.add_chunks(job_id, chunks, worker)
+            continue
+
+        stop_event.wait(poll_interval)
+    store.close()
+
+
+class JobWorkerPool:
+    """
+    Proses worker job koreksi. Proses dibuat dengan spawn (bukan fork) agar
+    tidak mewarisi thread proses API; setiap worker memuat AdvancedCorrector
+    sendiri satu kali. Worker yang mati dijalankan ulang dan chunk miliknya
+    dikembalikan ke antrean. Job yang selesai dihapus setelah retention detik.
+
+    Hanya satu pool yang aktif per JobStore: pool memegang lock file
+    <path>.lock (fcntl.lockf, dilepas otomatis saat proses mati dan tidak
+    diwarisi proses hasil fork). Pool lain pada store yang sama (mis. uvicorn
+    --workers N) menunggu sebagai cadangan dan mengambil alih saat lock bebas,
+    sehingga requeue tidak pernah menyentuh chunk milik pool lain yang masih hidup.
+    """
+
+    def __init__(self, path=JOBS_FILENAME, workers=2, corrector_kwargs=None, retention=24 * 3600,
+                 poll_interval=JOB_POLL_INTERVAL):
+        self.path = path
+        self.workers = workers
+        self.corrector_kwargs = corrector_kwargs or {}
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self.store = JobStore(path)
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes = []
+        self._stopping = threading.Event()
+        self._monitor = None
+        self._last_purge = time.monotonic()
+        self._lock_fd = None
+
+    @property
+    def active(self):
+        return self._lock_fd is not None
+
+    def start(self, monitor=True):
+        """
+        monitor=False: tidak membuat thread pemantau; pemanggil menjalankan check()
+        secara berkala (dipakai master preload-and-fork yang harus tetap tanpa thread).
+        """
+        if not self._activate():
+            print(f"[jobs] Another worker pool owns {self.path}; standing by.")
+        if monitor:
+            self._monitor = threading.Thread(target=self._watch, name="job-monitor", daemon=True)
+            self._monitor.start()
+
+    def _activate(self):
+        """Mengambil lock store lalu menjalankan worker; False jika pool lain masih memegang lock."""
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        # Pemegang lock sebelumnya sudah mati: pekerjaannya yang terputus dilanjutkan dari awal chunk
+        requeued = self.store.requeue()
+        if requeued: print(f"[jobs] Requeued {requeued} interrupted task(s).")
+        self.store.purge(self.retention)
+        self._last_purge = time.monotonic()
+        self._processes = [self._spawn() for _ in range(self.workers)]
+        return True
+
+    def _spawn(self):
+        process = self._context.Process(
+            target=worker_main, name="job-worker", daemon=True,
+            args=(self.path, self.corrector_kwargs, self._stop_event, self.poll_interval, os.getpid()),
+        )
+        process.start()
+        return process
+
+    def _watch(self):
+        while not self._stopping.wait(1.0): self.check()
+
+    def check(self):
+        """
+        Menjalankan ulang worker yang mati (chunk miliknya dikembalikan ke antrean)
+        dan menghapus job lama; pool cadangan mencoba mengambil alih lock store.
+        """
+        if not self.active:
+            if not self._stopping.is_set() and self._activate():
+                print(f"[jobs] Took over worker pool for {self.path}.")
+            return
+        for i, process in enumerate(self._processes):
+            if process.is_alive() or self._stopping.is_set(): continue
+            requeued = self.store.requeue([process.pid])
+            print(f"[jobs] Worker {process.pid} exited ({process.exitcode}); requeued {requeued} task(s), restarting.")
+            self._processes[i] = self._spawn()
+            self.restarts += 1
+        if time.monotonic() - self._last_purge > 3600:
+            self.store.purge(self.retention)
+            self._last_purge = time.monotonic()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "active": self.active,
+            "alive": sum(process.is_alive() for process in self._processes),
+            "pids": [process.pid for process in self._processes],
+            "restarts": self.restarts,
+            **self.store.counts(),
+        }
+
+    def stop(self, timeout=10.0):
+        self._stopping.set()
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive(): process.terminate()
+        for process in self._processes: process.join()
+        # Chunk yang terhenti karena terminate dikerjakan ulang setelah restart
+        self.store.requeue([process.pid for process in self._processes])
+        self.store.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
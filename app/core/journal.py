@@ -0,0 +1,73 @@
+from bisect import bisect_left, bisect_right
+
+
+class EditJournal:
+    """
+    Mencatat setiap edit yang dilakukan oleh stage koreksi sehingga offset
+    pada teks asli dapat dipetakan ke offset pada teks terkini.
+    Setiap stage menyimpan daftar edit (start, end, panjang_baru) dalam
+    koordinat teks input stage tersebut, terurut dan tidak saling tumpang tindih.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self._pending = None
+
+    # STAGE RECORDING
+    def begin_stage(self):
+        self._pending = []
+
+    def record(self, start, end, new_length):
+        if end - start == new_length == 0: return
+        self._pending.append((start, end, new_length))
+
+    def end_stage(self):
+        edits = self._pending or []
+        self._pending = None
+        if not edits: return
+        starts, ends, cumulative = [], [], [0]
+        for start, end, new_length in edits:
+            starts.append(start)
+            ends.append(end)
+            cumulative.append(cumulative[-1] + new_length - (end - start))
+        self.stages.append((starts, ends, edits, cumulative))
+
+    # OFFSET MAPPING
+    def map_offset(self, pos, side="start"):
+        """
+        Memetakan offset teks asli ke teks terkini.
+        Posisi di dalam area edit dipertahankan relatif terhadap awal edit,
+        dibatasi oleh panjang hasil edit. Pada sisipan (edit kosong) tepat di
+        posisi tersebut, side="start" berada setelah sisipan dan side="end" sebelumnya.
+        """
+        for starts, ends, edits, cumulative in self.stages:
+            if side == "start":
+                i = bisect_right(ends, pos)
+                if i < len(edits) and starts[i] < pos:
+                    start, _, new_length = edits[i]
+                    pos = start + cumulative[i] + min(pos - start, new_length)
+                else:
+                    pos = pos + cumulative[i]
+            else:
+                i = bisect_left(starts, pos)
+                if i > 0 and ends[i - 1] > pos:
+                    start, _, new_length = edits[i - 1]
+                    pos = start + cumulative[i - 1] + min(pos - start, new_length)
+                else:
+                    pos = pos + cumulative[i]
+        return pos
+
+    def map_span(self, start, end):
+        new_start = self.map_offset(start, "start")
+        new_end = self.map_offset(end, "end")
+        if new_end <= new_start: return None
+        return new_start, new_end
+
+    def map_entities(self, entities):
+        """Memetakan span hasil NER (teks asli) ke koordinat teks terkini."""
+        mapped = []
+        for entity in entities:
+            span = self.map_span(entity['start'], entity['end'])
+            if span is None: continue
+            mapped.append({**entity, 'start': span[0], 'end': span[1]})
+        return mapped
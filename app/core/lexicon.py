@@ -0,0 +1,30 @@
+# DATA SOURCES
+# Daftar kata non-morfologis (gazetteer & partikel) yang ikut dimasukkan ke kamus.
+
+def get_manual_cities():
+    raw_cities = "Ambon, Balikpapan, Banda Aceh, Bandar Lampung, Bandung, Banjar, Banjarbaru, Banjarmasin, Batam, Batu, Baubau, Bekasi, Bengkulu, Bima, Binjai, Bitung, Blitar, Bogor, Bontang, Bukittinggi, Cilegon, Cimahi, Cirebon, Denpasar, Depok, Dumai, Gorontalo, Gunungsitoli, Jakarta Barat, Jakarta Pusat, Jakarta Selatan, Jakarta Timur, Jakarta Utara, Jambi, Jayapura, Kediri, Kendari, Kotamobagu, Kupang, Langsa, Lhokseumawe, Lubuk Linggau, Madiun, Magelang, Makassar, Malang, Manado, Mataram, Medan, Metro, Mojokerto, Padang, Padang Panjang, Padangsidempuan, Pagar Alam, Palangka Raya, Palembang, Palopo, Palu, Pangkalpinang, Parepare, Pariaman, Pasuruan, Payakumbuh, Pekalongan, Pekanbaru, Pematangsiantar, Pontianak, Prabumulih, Probolinggo, Sabang, Salatiga, Samarinda, Sawahlunto, Semarang, Serang, Sibolga, Singkawang, Solok, Sorong, Subulussalam, Sukabumi, Sungai Penuh, Surabaya, Surakarta, Tangerang, Tangerang Selatan, Tanjungbalai, Tanjungpinang, Tarakan, Tasikmalaya, Tebing Tinggi, Tegal, Ternate, Tidore Kepulauan, Tomohon, Tual, Yogyakarta"
+    return [city.strip().lower() for city in raw_cities.split(',')]
+
+def get_provinces_and_islands():
+    raw_geo = "Aceh, Sumatera Utara, Sumatera Barat, Riau, Kepulauan Riau, Jambi, Bengkulu, Sumatera Selatan, Kepulauan Bangka Belitung, Lampung, Banten, DKI Jakarta, Jawa Barat, Jawa Tengah, DI Yogyakarta, Jawa Timur, Bali, Nusa Tenggara Barat, Nusa Tenggara Timur, Kalimantan Barat, Kalimantan Tengah, Kalimantan Selatan, Kalimantan Timur, Kalimantan Utara, Sulawesi Utara, Gorontalo, Sulawesi Tengah, Sulawesi Barat, Sulawesi Selatan, Sulawesi Tenggara, Maluku, Maluku Utara, Papua, Papua Barat, Papua Selatan, Papua Tengah, Papua Pegunungan, Papua Barat Daya, Sumatera, Jawa, Kalimantan, Sulawesi, Papua, Bali, Lombok, Sumbawa, Flores, Sumba, Timor, Halmahera, Seram, Buru, Bangka, Belitung, Nias, Mentawai, Madura"
+    return [geo.strip().lower() for geo in raw_geo.split(',')]
+
+def get_common_particles():
+    return ["saya", "aku", "ku", "hamba", "kami", "kita", "kamu", "engkau", "kau", "anda", "kalian", "saudara", "dia", "ia", "beliau", "mereka", "nya", "ini", "itu", "sini", "situ", "sana", "apa", "siapa", "mana", "kapan", "mengapa", "kenapa", "bagaimana", "berapa", "di", "ke", "dari", "pada", "dalam", "atas", "bawah", "kepada", "daripada", "untuk", "bagi", "guna", "buat", "oleh", "dengan", "tentang", "mengenai", "terhadap", "soal", "sejak", "semenjak", "sampai", "hingga", "keluar", "masuk", "dan", "serta", "atau", "tetapi", "tapi", "namun", "melainkan", "sedangkan", "jika", "kalau", "jikalau", "asal", "bila", "manakala", "agar", "supaya", "biar", "sebab", "karena", "lantaran", "sehingga", "maka", "akibatnya", "ketika", "sewaktu", "tatkala", "selagi", "seraya", "sambil", "setelah", "sesudah", "sebelum", "sehabis", "selesai", "bahwa", "yakni", "yaitu", "adalah", "ialah", "merupakan", "biarpun", "meskipun", "walaupun", "sekalipun", "sungguhpun", "padahal", "kendatipun", "kah", "lah", "tah", "pun", "per", "yang", "tak", "tidak", "bukan", "tanpa", "tiada", "belum", "sudah", "telah", "akan", "sedang", "lagi", "pernah", "masih", "baru", "ada", "bisa", "dapat", "boleh", "harus", "mesti", "wajib", "perlu", "butuh", "mau", "ingin", "hendak", "bakal", "sangat", "amat", "terlalu", "paling", "cukup", "kurang", "lebih", "agak", "hanya", "cuma", "saja", "juga", "pun", "nanti", "kemarin", "besok", "lusa", "sekarang", "dahulu", "dulu", "tadi", "barusan", "tentu", "pasti", "yakin", "memang", "barangkali", "mungkin", "bahkan", "malah", "justru", "segera", "langsung", "lantas", "kemudian", "lalu", "akhirnya", "pak", "bapak", "bu", "ibu", "mas", "mbak", "kak", "kakak", "bang", "abang", "dik", "adik", "om", "tante"]
+
+CUSTOM_ENTITIES = ["rupiah", "hobi", "proyek", "triliun", "miliar", "juta", "senin", "selasa", "rabu", "kamis", "jumat", "sabtu", "minggu"]
+
+def get_extra_words():
+    """Kata tambahan di luar hasil morfologi: bagian gazetteer, partikel, dan entitas khusus."""
+    words = set()
+    for item in get_manual_cities() + get_provinces_and_islands() + get_common_particles():
+        for part in item.split(): words.add(part)
+    words.update(CUSTOM_ENTITIES)
+    return words
+
+# Nama tempat yang juga kata umum (atau berbenturan dengan preposisi "di"): tidak dikapitalisasi langsung oleh gazetteer,
+# kalimatnya tetap dikirim ke NER untuk memutuskan apakah itu entitas
+AMBIGUOUS_PLACE_NAMES = ["batu", "metro", "padang", "padang panjang", "serang", "malang", "medan", "palu", "buru", "seram", "banjar", "tegal", "sorong", "solok", "bima", "timor", "sungai penuh", "tebing tinggi", "di yogyakarta"]
+
+# Nama tempat tambahan untuk gazetteer (tidak ada di daftar kota/provinsi sebagai satu kata)
+EXTRA_PLACE_NAMES = ["jakarta"]
@@ -0,0 +1,173 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Bucket latensi (detik) dan ukuran dokumen (karakter)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra: pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Counter monotonik dengan label opsional."""
+
+    type_name = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def inc_many(self, counts):
+        """Menambah banyak label sekaligus: {label tuple: jumlah}."""
+        with self._lock:
+            for labels, amount in counts.items():
+                self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock: values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {value}" for labels, value in values]
+
+
+class Histogram:
+    """Histogram kumulatif ala Prometheus (bucket le, _sum, _count) dengan label opsional."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        self.observe_many(((value, labels),))
+
+    def observe_many(self, observations):
+        """Mencatat banyak (nilai, label tuple) dengan satu kali lock."""
+        buckets = self.buckets
+        with self._lock:
+            for value, labels in observations:
+                series = self._series.get(labels)
+                if series is None: series = self._series[labels] = [[0] * (len(buckets) + 1), 0.0]
+                series[0][bisect_left(buckets, value)] += 1
+                series[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        """Mengukur durasi blok with."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self):
+        with self._lock: series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        lines = []
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class StageClock:
+    """
+    Pengukur stage berurutan dengan overhead minimal: lap(stage) menyimpan durasi
+    sejak lap sebelumnya, dan flush() mencatat semuanya ke histogram dengan
+    satu kali lock serta ke sink (dict, ms) jika diberikan.
+    """
+
+    __slots__ = ("histogram", "sink", "last", "laps")
+
+    def __init__(self, histogram, sink=None):
+        self.histogram = histogram
+        self.sink = sink
+        self.last = time.perf_counter()
+        self.laps = []
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.laps.append((now - self.last, (stage,)))
+        self.last = now
+
+    def flush(self):
+        self.histogram.observe_many(self.laps)
+        if self.sink is not None:
+            for elapsed, (stage,) in self.laps: self.sink[stage] = self.sink.get(stage, 0.0) + elapsed * 1000
+        self.laps = []
+
+
+class MetricsRegistry:
+    """
+    Kumpulan metrik proses ini dalam format teks Prometheus. Nilai dari
+    komponen lain (pool, cache) ditambahkan lewat collector yang dipanggil
+    saat render: fungsi yang mengembalikan [(nama, help, tipe, nilai)].
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, help_text, type_name, value in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {type_name}")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "correction_stage_seconds", "Durasi setiap stage pipeline koreksi.", ("stage",)))
+NER_FORWARD_SECONDS = REGISTRY.register(Histogram(
+    "ner_forward_seconds", "Durasi satu forward pass NER (satu batch)."))
+NER_BATCH_SENTENCES = REGISTRY.register(Histogram(
+    "ner_batch_sentences", "Jumlah kalimat per forward pass NER.", buckets=(1, 2, 4, 8, 16, 32, 64)))
+SYMSPELL_LOOKUP_SECONDS = REGISTRY.register(Histogram(
+    "symspell_lookup_seconds", "Durasi lookup kamus (exact) dan SymSpell fuzzy.", ("kind",)))
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    "parse_seconds", "Durasi parsing file (per file atau per chunk streaming).", ("format",)))
+DOCUMENT_CHARS = REGISTRY.register(Histogram(
+    "document_chars", "Ukuran dokumen yang dikoreksi (karakter).", buckets=SIZE_BUCKETS))
+TOKENS_TOTAL = REGISTRY.register(Counter(
+    "correction_tokens_total", "Jumlah token yang diproses pipeline (tidak termasuk paragraf dari cache)."))
+CORRECTIONS_TOTAL = REGISTRY.register(Counter(
+    "corrections_total", "Jumlah koreksi yang dikembalikan, per tipe log.", ("type",)))
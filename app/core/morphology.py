@@ -0,0 +1,173 @@
+import re
+from functools import lru_cache
+
+# Naikkan jika aturan morfologi berubah agar artefak kamus dibangun ulang
+MORPHOLOGY_VERSION = "v7"
+
+# Hanya kata dengan pola ini yang ditulis ke kamus
+DICTIONARY_WORD_PATTERN = re.compile(r'^[a-z\-]+$')
+
+SUFFIXES_TRANSITIVE = ['kan', 'i']
+ENCLITICS = ['nya', 'ku', 'mu']
+PARTICLES = ['lah', 'kah', 'pun']
+
+
+# MORPHOLOGICAL GENERATION LOGIC
+# --- PERBAIKAN LOGIKA MORFOLOGI ---
+def level1_forms(root):
+    """Bentuk Level 1 (root + prefix dasar) dari sebuah kata dasar."""
+    first = root[0]
+    second = root[1] if len(root) > 1 else ""
+    is_vowel = second in 'aiueo'
+
+    def get_nasal_root(prefix, r):
+        if prefix in ['me', 'pe']:
+            # Aturan Peluluhan (KPST)
+            if first == 'k': return prefix + 'ng' + (r[1:] if is_vowel else r)
+            elif first == 'p': return prefix + 'm' + (r[1:] if is_vowel else r)
+            elif first == 's': return prefix + 'ny' + (r[1:] if is_vowel else r)
+            elif first == 't': return prefix + 'n' + (r[1:] if is_vowel else r)
+
+            # Aturan B, F, V -> Mem/Pem (INI YANG DITAMBAHKAN)
+            # Contoh: Bangun -> Pembangun, Fokus -> Pemfokus
+            elif first in 'bfv': return prefix + 'm' + r
+
+            # Aturan C, D, J, Z -> Men/Pen
+            # Contoh: Cuci -> Pencuci
+            elif first in 'cdjz': return prefix + 'n' + r
+
+            # Aturan Vokal, G, H, Kh -> Meng/Peng
+            # Contoh: Ajar -> Pengajar, Huni -> Penghuni
+            elif first in 'gh' or (first=='k' and second=='h'): return prefix + 'ng' + r
+            elif first in 'aiueo': return prefix + 'ng' + r
+
+            # Huruf L, M, N, R, W, Y -> Tetap (Me/Pe)
+            # Contoh: Larang -> Pelarang
+            elif first in 'lmnrwy': return prefix + r
+
+        return prefix + r
+
+    def get_ber_ter_root(prefix, r):
+        # Aturan Ber/Ter/Per -> Be/Te/Pe jika huruf awal R
+        # Contoh: Racun -> Beracun (Bukan Berracun)
+        if r.startswith('r'): return prefix[:-1] + r
+        # Contoh: Ajar -> Belajar (Pengecualian khusus, tapi kita generalisir dulu)
+        if r == 'ajar' and prefix == 'ber': return 'bel' + r
+        return prefix + r
+
+    level1_bases = set()
+    level1_bases.add(root)
+
+    # Me- / Pe-
+    level1_bases.add(get_nasal_root('me', root))
+    level1_bases.add(get_nasal_root('pe', root)) # Bangun -> Pembangun
+
+    # Di- / Ke- / Se-
+    level1_bases.add('di' + root)
+    level1_bases.add('ke' + root)
+    level1_bases.add('se' + root)
+
+    # Ber- / Ter- / Per-
+    level1_bases.add(get_ber_ter_root('ber', root))
+    level1_bases.add(get_ber_ter_root('ter', root))
+    level1_bases.add(get_ber_ter_root('per', root))
+    return level1_bases
+
+
+def apply_morphology(root):
+    """
+    Generate kata turunan dengan level imbuhan ganda.
+    Sekarang mendukung huruf B, F, V (Bangun -> Pembangunan).
+    """
+    forms = set()
+    forms.add(root)
+
+    # --- LEVEL 1: PREFIX DASAR ---
+    level1_bases = level1_forms(root)
+    forms.update(level1_bases)
+
+    # --- LEVEL 2: TRANSITIVE/NOUN SUFFIX (-kan, -i, -an) ---
+    level2_bases = set()
+
+    for base in level1_bases:
+        # 1. Tambah -an (Noun)
+        # Logika: Pembangun (Level 1) + an -> Pembangunan (Level 2)
+        noun_form = base + 'an'
+        level2_bases.add(noun_form)
+
+        # 2. Tambah -kan / -i (Verb Transitive)
+        if base.startswith(('me', 'di', 'ter')):
+            for suf in SUFFIXES_TRANSITIVE:
+                level2_bases.add(base + suf)
+
+    forms.update(level2_bases)
+
+    # --- LEVEL 3: ENCLITICS (SUFFIX STACKING) ---
+    # Menambahkan -nya, -ku, -mu, -lah, -kah ke hasil Level 1 dan 2
+    candidates_for_enclitics = level1_bases.union(level2_bases)
+
+    for base in candidates_for_enclitics:
+        for enc in ENCLITICS:
+            forms.add(base + enc) # pembangunannya
+
+        for part in PARTICLES:
+            forms.add(base + part)
+
+    return forms
+
+
+# MORPHOLOGICAL VALIDATION
+class MorphologyValidator:
+    """
+    Validasi kata turunan tanpa kamus hasil ekspansi.
+    Enklitik/partikel, sufiks (-an, -kan, -i) dan prefix (me-/pe- dengan
+    peluluhan nasal, ber-/ter-/per-, di-/ke-/se-) dilepas saat lookup untuk
+    menghasilkan kandidat kata dasar. Setiap kandidat diverifikasi ulang dengan
+    level1_forms sehingga keputusan terima/tolak identik dengan kamus hasil
+    apply_morphology.
+    """
+
+    def __init__(self, roots, extras=(), cache_size=200_000):
+        self.roots = frozenset(roots)
+        self.extras = frozenset(w for w in extras if DICTIONARY_WORD_PATTERN.match(w))
+        self.is_valid = lru_cache(maxsize=cache_size)(self._is_valid)
+
+    def _is_valid(self, word):
+        if word in self.extras: return True
+        if not DICTIONARY_WORD_PATTERN.match(word): return False
+        if self._is_level2(word): return True
+        # Level 3: enklitik dan partikel di atas bentuk Level 1/2
+        for suffix in ENCLITICS + PARTICLES:
+            if word.endswith(suffix) and self._is_level2(word[:-len(suffix)]): return True
+        return False
+
+    def _is_level2(self, word):
+        if self._is_level1(word): return True
+        if word.endswith('an') and self._is_level1(word[:-2]): return True
+        for suffix in SUFFIXES_TRANSITIVE:
+            base = word[:-len(suffix)]
+            if word.endswith(suffix) and base.startswith(('me', 'di', 'ter')) and self._is_level1(base):
+                return True
+        return False
+
+    def _is_level1(self, base):
+        if not base: return False
+        for root in self._root_candidates(base):
+            if root in self.roots and base in level1_forms(root): return True
+        return False
+
+    def _root_candidates(self, base):
+        """Superset kandidat kata dasar untuk sebuah bentuk Level 1."""
+        candidates = {base}
+        head, rest = base[:2], base[2:]
+        if head in ('di', 'ke', 'se'):
+            candidates.add(rest)
+        if head in ('be', 'te', 'pe'):
+            # ber-/ter-/per-, be-/te-/pe- + r..., bel- + ajar
+            candidates.add(rest)
+            candidates.add(base[3:])
+        if head in ('me', 'pe'):
+            # Kebalikan peluluhan nasal: ng/m/ny/n bisa menggantikan k/p/s/t
+            candidates.update((rest, rest[1:], rest[2:], 'k' + rest[2:], 'p' + rest[1:], 's' + rest[2:], 't' + rest[1:]))
+        candidates.discard("")
+        return candidates
@@ -0,0 +1,72 @@
+import os
+
+from transformers import pipeline
+
+NER_MODEL_NAME = "cahya/bert-base-indonesian-NER"
+
+# "pytorch": model fp32 bawaan transformers
+# "onnx": graph hasil ekspor ONNX Runtime (fp32)
+# "onnx-int8": graph ONNX dengan kuantisasi dinamis int8
+NER_ENGINES = ("pytorch", "onnx", "onnx-int8")
+ONNX_DIR = os.path.join("data", "onnx", "bert-base-indonesian-NER")
+ONNX_INT8_DIR = ONNX_DIR + "-int8"
+ONNX_FILE_NAMES = {"onnx": "model.onnx", "onnx-int8": "model_quantized.onnx"}
+
+
+def onnx_dir_for(engine):
+    return ONNX_INT8_DIR if engine == "onnx-int8" else ONNX_DIR
+
+
+def load_ner_pipeline(engine="pytorch", model_name=NER_MODEL_NAME):
+    """
+    Membuat pipeline token-classification untuk engine yang dipilih. Semua engine
+    memakai aggregation_strategy="simple" sehingga format span keluarannya sama.
+    Engine ONNX membutuhkan optimum[onnxruntime] dan hasil scripts.export_ner_onnx.
+    """
+    if engine not in NER_ENGINES:
+        raise ValueError(f"Unknown NER engine: {engine}")
+    if engine == "pytorch":
+        return pipeline("token-classification", model=model_name, tokenizer=model_name, aggregation_strategy="simple")
+
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise RuntimeError(f"NER engine '{engine}' requires optimum[onnxruntime]: {e}") from e
+
+    model_dir = onnx_dir_for(engine)
+    file_name = ONNX_FILE_NAMES[engine]
+    if not os.path.exists(os.path.join(model_dir, file_name)):
+        raise RuntimeError(f"{model_dir}/{file_name} not found. Export it with: python -m scripts.export_ner_onnx")
+    model = ORTModelForTokenClassification.from_pretrained(model_dir, file_name=file_name)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline("token-classification", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
+
+
+def set_torch_threads(threads):
+    """Membatasi thread intra-op PyTorch agar beberapa worker tidak berebut core yang sama."""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+def export_onnx(model_name=NER_MODEL_NAME, output_dir=ONNX_DIR, int8_dir=ONNX_INT8_DIR, quantize=True):
+    """Ekspor model ke ONNX (fp32) dan, opsional, versi kuantisasi dinamis int8."""
+    from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    print(f"Exporting {model_name} to ONNX at {output_dir}...")
+    model = ORTModelForTokenClassification.from_pretrained(model_name, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+
+    if quantize:
+        print(f"Quantizing (dynamic int8) to {int8_dir}...")
+        quantizer = ORTQuantizer.from_pretrained(output_dir, file_name=ONNX_FILE_NAMES["onnx"])
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=int8_dir, quantization_config=qconfig)
+        tokenizer.save_pretrained(int8_dir)
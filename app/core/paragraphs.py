@@ -0,0 +1,57 @@
+import hashlib
+import re
+
+# Paragraf dipisahkan oleh baris kosong; pemisah mencakup seluruh spasi di sekitarnya.
+# Pola diawali "\n" agar regex hanya dicoba di baris baru, bukan di setiap spasi.
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n\s*')
+
+
+def split_paragraphs(text):
+    """
+    Memecah teks menjadi (separators, paragraphs, tail) sehingga
+    text == "".join(s + p for s, p in zip(separators, paragraphs)) + tail.
+    Paragraf tidak pernah diawali atau diakhiri spasi.
+    """
+    body = text.strip()
+    if not body: return [], [], text
+    lead = text[:len(text) - len(text.lstrip())]
+    tail = text[len(text.rstrip()):]
+    separators, paragraphs, last = [lead], [], 0
+    for match in PARAGRAPH_BREAK.finditer(body):
+        # Spasi sebelum baris baru pertama ikut menjadi bagian pemisah
+        end = last + len(body[last:match.start()].rstrip())
+        paragraphs.append(body[last:end])
+        separators.append(body[end:match.end()])
+        last = match.end()
+    paragraphs.append(body[last:])
+    return separators, paragraphs, tail
+
+
+def sentence_starts(separators, paragraphs, first=None):
+    """
+    Apakah huruf pertama setiap paragraf berada di awal kalimat, sama seperti
+    jika seluruh teks dikoreksi sekaligus: paragraf pertama selalu, kecuali
+    first=False (lanjutan dari chunk sebelumnya), paragraf berikutnya jika
+    paragraf sebelumnya diakhiri [.!?].
+    """
+    if first is None: first = True
+    starts = []
+    for i, paragraph in enumerate(paragraphs):
+        starts.append(first if i == 0 else paragraphs[i - 1][-1] in '.!?')
+    return starts
+
+
+def next_sentence_start(text, sep, start=None):
+    """
+    Konteks awal kalimat untuk chunk setelah text + sep, agar dokumen yang
+    dikoreksi per chunk menghasilkan teks yang sama dengan koreksi sekaligus.
+    start adalah konteks chunk ini (None untuk chunk pertama).
+    """
+    body = text.rstrip()
+    # Chunk tanpa kata tidak mengubah konteks: kata pertama dokumen tetap awal kalimat
+    if not body: return start
+    return bool(text[len(body):] + sep) and body[-1] in '.!?'
+
+
+def paragraph_key(paragraph, sentence_start):
+    return hashlib.sha256(f"{int(sentence_start)}\0{paragraph}".encode("utf-8")).hexdigest()
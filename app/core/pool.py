@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolSaturated(Exception):
+    """Dilempar ketika seluruh slot worker dan antrean sudah terpakai."""
+
+
+class CorrectionPool:
+    """
+    Thread pool berbatas untuk pekerjaan koreksi yang sinkron.
+    Thread dipilih (bukan proses) karena model NER dan indeks SymSpell cukup
+    dimuat sekali, dan NER dari beberapa thread digabung oleh NerBatcher.
+    Jumlah pekerjaan yang berjalan + mengantre dibatasi; jika penuh,
+    submit langsung gagal dengan PoolSaturated (backpressure). Pemanggil yang
+    memilih menunggu (wait=True) diantrekan dan menerima slot langsung saat
+    pekerjaan lain selesai, tanpa polling.
+    """
+
+    def __init__(self, max_workers=4, max_pending=16):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="corrector")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._waiters = deque()
+
+    async def run(self, fn, *args, wait=False):
+        """
+        Menjalankan fn(*args) di pool tanpa memblokir event loop.
+        wait=True menunggu slot kosong alih-alih melempar PoolSaturated; dipakai
+        untuk chunk lanjutan dari request streaming yang sudah diterima.
+        """
+        if not self._slots.acquire(blocking=False):
+            if not wait:
+                with self._lock: self._rejected += 1
+                raise PoolSaturated("Correction pool is saturated.")
+            await self._wait_for_slot()
+        with self._lock: self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    async def _wait_for_slot(self):
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        with self._lock:
+            # Slot bisa saja dilepas sebelum waiter terdaftar
+            if self._slots.acquire(blocking=False): return
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Request dibatalkan (mis. klien memutus stream): slot yang sudah diserahkan dikembalikan
+            if waiter.done() and not waiter.cancelled():
+                self._free_slot()
+            else:
+                with self._lock:
+                    if (loop, waiter) in self._waiters: self._waiters.remove((loop, waiter))
+            raise
+
+    def _release(self):
+        with self._lock: self._in_flight -= 1
+        self._free_slot()
+
+    def _free_slot(self):
+        """Menyerahkan slot ke waiter tertua (di event loop miliknya), atau mengembalikannya ke semaphore."""
+        with self._lock:
+            if not self._waiters:
+                self._slots.release()
+                return
+            loop, waiter = self._waiters.popleft()
+        loop.call_soon_threadsafe(self._hand_over, waiter)
+
+    def _hand_over(self, waiter):
+        if waiter.done(): self._free_slot()
+        else: waiter.set_result(None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+
+from app.core.journal import EditJournal
+
+
+@dataclass
+class CorrectionResult:
+    """Hasil satu panggilan AdvancedCorrector.process()."""
+    text: str
+    changes: list = field(default_factory=list)
+    # Durasi per stage (ms), hanya jika diminta (timings=True)
+    timings: dict = None
+
+
+class CorrectionContext:
+    """
+    State milik satu panggilan process(): journal edit dan log perubahan.
+    Tidak dibagi antar request sehingga aman dipakai secara konkuren.
+    """
+
+    def __init__(self):
+        self.journal = EditJournal()
+        self.changes = []
+
+    def log_change(self, type_err, original, fixed):
+        if original != fixed:
+            self.changes.append({"Type": type_err, "Original": original, "Fixed": fixed})
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import time
+
+from symspellpy import SymSpell
+
+# SNAPSHOT FORMAT
+# <kamus>.symspell     : pickle SymSpell tanpa kompresi (SymSpell.save_pickle/load_pickle)
+# <kamus>.symspell.key : [magic 8 byte][versi format 4 byte][key sha256 hex 64 byte]
+SNAPSHOT_MAGIC = b"SYMSNAP\0"
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path_for(dict_path):
+    return os.path.splitext(dict_path)[0] + ".symspell"
+
+
+def snapshot_key(dict_path, max_edit_distance, prefix_length, count_threshold=1, content_sha256=None):
+    """Key snapshot: hash isi kamus + parameter SymSpell + versi format."""
+    digest = hashlib.sha256()
+    digest.update((content_sha256 or file_sha256(dict_path)).encode())
+    params = f"{max_edit_distance}|{prefix_length}|{count_threshold}|{SymSpell.data_version}|{SNAPSHOT_FORMAT_VERSION}"
+    digest.update(params.encode())
+    return digest.hexdigest()
+
+
+def _header(key):
+    return SNAPSHOT_MAGIC + SNAPSHOT_FORMAT_VERSION.to_bytes(4, "little") + key.encode("ascii")
+
+
+def _write_synced(path, write):
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    write(tmp_path)
+    with open(tmp_path, "rb+") as f: os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_snapshot(sym_spell, path, key):
+    """
+    Menulis snapshot secara atomik (file sementara lalu os.replace). File key
+    dihapus lebih dulu dan ditulis paling akhir, sehingga snapshot yang
+    terpotong di tengah penulisan tidak pernah dianggap valid.
+    """
+    key_path = f"{path}.key"
+    if os.path.exists(key_path): os.remove(key_path)
+    _write_synced(path, lambda tmp_path: sym_spell.save_pickle(tmp_path, compressed=False))
+
+    def write_key(tmp_path):
+        with open(tmp_path, "wb") as f: f.write(_header(key))
+    _write_synced(key_path, write_key)
+
+
+def load_snapshot(sym_spell, path, key):
+    """
+    Memuat snapshot dengan SymSpell.load_pickle. Mengembalikan False jika file
+    tidak ada, rusak, atau key-nya tidak cocok (snapshot basi).
+    """
+    key_path = f"{path}.key"
+    if not (os.path.exists(path) and os.path.exists(key_path)): return False
+    with open(key_path, "rb") as f:
+        if f.read() != _header(key): return False
+    try:
+        return sym_spell.load_pickle(path, compressed=False)
+    except Exception as e:
+        print(f"    [WARN] Corrupt SymSpell snapshot {path}: {e}")
+        return False
+
+
+def load_symspell(sym_spell, dict_path, max_edit_distance, prefix_length, snapshot_path=None, content_sha256=None):
+    """
+    Memuat indeks SymSpell dari snapshot biner jika masih valid; jika tidak,
+    membangun ulang dari kamus teks lalu menyimpan snapshot baru.
+    content_sha256 (opsional) adalah hash kamus yang sudah diketahui, misalnya dari manifest.
+    Mengembalikan sumber yang dipakai: "snapshot" atau "text".
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(dict_path)
+    key = snapshot_key(dict_path, max_edit_distance, prefix_length, content_sha256=content_sha256)
+
+    started = time.perf_counter()
+    if load_snapshot(sym_spell, snapshot_path, key):
+        print(f"    Loaded SymSpell snapshot {snapshot_path} in {time.perf_counter() - started:.2f}s")
+        return "snapshot"
+
+    print(f"    Snapshot missing or stale, rebuilding index from {dict_path}...")
+    sym_spell.load_dictionary(dict_path, term_index=0, count_index=1)
+    save_snapshot(sym_spell, snapshot_path, key)
+    print(f"    Built SymSpell index and snapshot in {time.perf_counter() - started:.2f}s")
+    return "text"
@@ -0,0 +1,48 @@
+from bisect import bisect_right
+
+
+class SpanIndex:
+    """
+    Kumpulan span [start, end) yang sudah digabung menjadi interval terurut
+    dan tidak saling tumpang tindih, untuk pengecekan overlap token.
+    """
+
+    def __init__(self, spans=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(spans):
+            if end <= start: continue
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]: self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        """Lookup bisect: apakah [start, end) beririsan dengan salah satu span."""
+        i = bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def sweep(self):
+        return SpanSweep(self)
+
+
+class SpanSweep:
+    """
+    Two-pointer sweep untuk query yang datang berurutan menurut posisi
+    (misalnya token dari kiri ke kanan): pointer span hanya bergerak maju.
+    """
+
+    def __init__(self, index):
+        self.starts = index.starts
+        self.ends = index.ends
+        self.i = 0
+
+    def overlaps(self, start, end):
+        ends, n = self.ends, len(self.ends)
+        while self.i < n and ends[self.i] <= start:
+            self.i += 1
+        return self.i < n and self.starts[self.i] < end
@@ -0,0 +1,167 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, groupby
+
+PUNCTUATION = ".,;:?!"
+
+# Token adalah potongan non-spasi beserta spasi di depannya (gap). Potongan
+# juga dipecah setelah tanda baca yang langsung diikuti huruf (tempat
+# fix_punctuation_spacing menyisipkan spasi), sehingga stage tidak perlu
+# memecah token lagi.
+WORD_PATTERN = re.compile(r'\S+')
+SPLIT_PATTERN = re.compile(r'[.,;:?!](?=[a-zA-Z])')
+LEADING_PUNCT_PATTERN = re.compile(r'(?<!\S)[.,;:?!]')
+DIGIT_PATTERN = re.compile(r'\d')
+DIGIT_RUN_PATTERN = re.compile(r'\d+')
+
+# Flag token (diisi saat tokenisasi)
+FLAG_DIGIT = 1   # mengandung angka
+FLAG_PUNCT = 2   # diawali tanda baca
+FLAG_GLUED = 4   # menempel ke token sebelumnya (setelah tanda baca yang diikuti huruf)
+
+
+class TokenArray:
+    """
+    Teks sebagai array token paralel: spasi di depan token (gap), teks token,
+    offset [start, end) pada teks input, dan flag. Stage koreksi berjalan
+    sebagai pass linear di atas array ini; teks keluaran dibentuk sekali
+    lewat materialize(), dengan spasi dan baris baru asli tetap dipertahankan.
+    Offset pada teks terkini dihitung ulang lewat positions() bila diperlukan.
+    """
+
+    __slots__ = ("source", "gaps", "words", "starts", "ends", "flags", "tail")
+
+    def __init__(self, source):
+        self.source = source
+        self.gaps = []
+        self.words = []
+        self.starts = array('q')
+        self.ends = array('q')
+        self.flags = array('B')
+        self.tail = ""
+
+    @classmethod
+    def tokenize(cls, text):
+        """Tokenisasi satu kali dengan scan regex (C) tanpa loop per karakter di Python."""
+        tokens = cls(text)
+        gaps = WORD_PATTERN.split(text)
+        tokens.tail = gaps.pop()
+        if not gaps: return tokens
+        tokens.gaps = gaps
+        tokens.words = WORD_PATTERN.findall(text)
+        # Panjang gap dan kata bergantian; jumlah kumulatifnya adalah offset start/end
+        offsets = array('q', accumulate(map(len, chain.from_iterable(zip(tokens.gaps, tokens.words)))))
+        tokens.starts = offsets[0::2]
+        tokens.ends = offsets[1::2]
+        tokens.flags = array('B', bytes(len(tokens.words)))
+        splits = [match.end() for match in SPLIT_PATTERN.finditer(text)]
+        if splits: tokens._split(splits)
+
+        flags = tokens.flags
+        for match in DIGIT_RUN_PATTERN.finditer(text): flags[tokens.token_at(match.start())] |= FLAG_DIGIT
+        for match in LEADING_PUNCT_PATTERN.finditer(text): flags[tokens.token_at(match.start())] |= FLAG_PUNCT
+        return tokens
+
+    def _split(self, positions):
+        """Memecah token pada offset positions (terurut, selalu di dalam token)."""
+        gaps, words, starts, ends, flags = [], [], array('q'), array('q'), array('B')
+        columns = ((gaps, self.gaps), (words, self.words), (starts, self.starts), (ends, self.ends), (flags, self.flags))
+        previous = 0
+        for i, group in groupby(positions, key=self.token_at):
+            for target, column in columns: target.extend(column[previous:i])
+            word, base = self.words[i], self.starts[i]
+            start = base
+            for n, pos in enumerate(chain(group, (self.ends[i],))):
+                gaps.append("" if n else self.gaps[i])
+                words.append(word[start - base:pos - base])
+                starts.append(start)
+                ends.append(pos)
+                flags.append(FLAG_GLUED if n else 0)
+                start = pos
+            previous = i + 1
+        for target, column in columns: target.extend(column[previous:])
+        self.gaps, self.words, self.starts, self.ends, self.flags = gaps, words, starts, ends, flags
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return zip(self.gaps, self.words, self.starts, self.ends, self.flags)
+
+    def materialize(self):
+        return "".join(chain.from_iterable(zip(self.gaps, self.words))) + self.tail
+
+    # EDITING
+    def replace(self, replacements, journal):
+        """
+        Menerapkan penggantian (indeks, kata baru, edit) hasil satu pass, terurut
+        menurut indeks. Edit (awal, akhir, panjang baru) relatif terhadap kata
+        dan dicatat ke journal dalam koordinat teks sebelum pass.
+        """
+        journal.begin_stage()
+        positions = None
+        for i, word, edits in replacements:
+            if edits:
+                if positions is None: positions = self.positions()
+                for start, end, new_length in edits:
+                    journal.record(positions[i] + start, positions[i] + end, new_length)
+            self.words[i] = word
+        journal.end_stage()
+
+    def absorb(self, indices):
+        """Menggabungkan token pada indices (terurut, > 0) ke token tersisa sebelumnya."""
+        tokens = TokenArray(self.source)
+        tokens.tail = self.tail
+        columns = ((tokens.gaps, self.gaps), (tokens.words, self.words), (tokens.starts, self.starts),
+                   (tokens.ends, self.ends), (tokens.flags, self.flags))
+        previous = 0
+        for i in indices:
+            # Token di antara dua penggabungan disalin per slice
+            for target, column in columns: target.extend(column[previous:i])
+            tokens.words[-1] = tokens.words[-1] + self.gaps[i] + self.words[i]
+            tokens.ends[-1] = self.ends[i]
+            tokens.flags[-1] |= self.flags[i]
+            previous = i + 1
+        for target, column in columns: target.extend(column[previous:])
+        return tokens
+
+    # OFFSET HELPERS
+    def token_at(self, pos):
+        """Indeks token yang memuat offset teks input pos."""
+        return bisect_right(self.starts, pos) - 1
+
+    def positions(self):
+        """Offset awal setiap token pada teks terkini."""
+        return array('q', accumulate(map(len, chain.from_iterable(zip(self.gaps, self.words)))))[0::2]
+
+    def locate(self, start, end, positions):
+        """Potongan token (indeks, awal, akhir) yang dicakup span [start, end) teks terkini."""
+        pieces = []
+        first = max(bisect_right(positions, start) - 1, 0)
+        for i in range(first, bisect_left(positions, end)):
+            offset, size = positions[i], len(self.words[i])
+            local_start, local_end = max(start - offset, 0), min(end - offset, size)
+            if local_start < local_end: pieces.append((i, local_start, local_end))
+        return pieces
+
+    def context(self, i, start, end, radius):
+        """Teks terkini di sekitar words[i][start:end], radius karakter ke kiri dan kanan."""
+        word = self.words[i]
+        left, size, j = [word[:start]], start, i
+        while size < radius and j >= 0:
+            left.append(self.gaps[j])
+            size += len(self.gaps[j])
+            j -= 1
+            if j >= 0:
+                left.append(self.words[j])
+                size += len(self.words[j])
+        right, size, j = [word[end:]], len(word) - end, i + 1
+        while size < radius and j < len(self.words):
+            right.append(self.gaps[j])
+            right.append(self.words[j])
+            size += len(self.gaps[j]) + len(self.words[j])
+            j += 1
+        if size < radius: right.append(self.tail)
+        left_text = "".join(reversed(left))
+        return left_text[max(0, len(left_text) - radius):] + word[start:end] + "".join(right)[:radius]
@@ -1,14 +1,107 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from typing import List
 import uvicorn
+import json
+import os
+import time
 
 # MODULE IMPORTS
+from app.core.cache import PARAGRAPH_CACHE, SPELLING_CACHE
 from app.core.corrector import AdvancedCorrector
-from app.utils.parsers import parse_txt, parse_pdf, parse_docx
+from app.core.jobs import (
+    JOB_CANCELLED, JOB_DONE, JOB_FINISHED, JOB_QUEUED, JOBS_FILENAME, JobNotFound, JobStore, JobWorkerPool,
+)
+from app.core.metrics import REGISTRY
+from app.core.paragraphs import next_sentence_start
+from app.core.pool import CorrectionPool, PoolSaturated
+from app.utils.parsers import parse_txt, parse_pdf, parse_docx, iter_chunks
+
+# WORKER POOL CONFIGURATION
+CORRECTION_WORKERS = int(os.environ.get("CORRECTION_WORKERS", "4"))
+CORRECTION_MAX_PENDING = int(os.environ.get("CORRECTION_MAX_PENDING", "16"))
+CORRECTION_MAX_BATCH_ITEMS = int(os.environ.get("CORRECTION_MAX_BATCH_ITEMS", "10000"))
+
+# MODEL CONFIGURATION
+NER_ENGINE = os.environ.get("NER_ENGINE", "pytorch")
+NER_GATE = os.environ.get("NER_GATE", "1") == "1"
+
+# CACHE CONFIGURATION (kosong = cache paragraf hanya di memori)
+PARAGRAPH_CACHE_PATH = os.environ.get("PARAGRAPH_CACHE_PATH", "")
+
+# JOB QUEUE CONFIGURATION (opt-in; 0 worker = endpoint /jobs dinonaktifkan)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "0"))
+JOBS_PATH = os.environ.get("JOBS_PATH", JOBS_FILENAME)
+JOB_RETENTION_HOURS = float(os.environ.get("JOB_RETENTION_HOURS", "24"))
+
+CORRECTOR_OPTIONS = {
+    "ner_engine": NER_ENGINE,
+    "paragraph_store_path": PARAGRAPH_CACHE_PATH or None,
+    "ner_gate": NER_GATE,
+}
+
+# Teks warmup: menjalankan NER (huruf kapital di tengah kalimat), ejaan, KPST, reduplikasi, dan angka
+WARMUP_TEXTS = [
+    "laporan dari Budi Santoso mengenai proyek di papua pegunungan",
+    "rapat di jawa tengah di hadiri 25 orang pada tanggal 5 mei.",
+    "mereka mentulis surat surat untuk kepala desa",
+]
+
+# PROCESS STATE (dibuat oleh initialize(); pada mode preload dipanggil di master sebelum fork)
+global_corrector = None
+correction_pool = None
+job_store = None
+job_pool = None
+warmup_report = None
+# False jika worker job dikelola master preload-and-fork (app/server.py), bukan oleh setiap worker HTTP
+manage_job_workers = True
+
+def initialize(corrector=None):
+    """Memuat model dan kamus sekali per proses; tidak melakukan apa-apa jika sudah dimuat."""
+    global global_corrector, correction_pool
+    if global_corrector is None:
+        print("Initializing Global Logic...")
+        # Store SQLite dibuka di lifespan setiap worker, tidak diwariskan lewat fork
+        global_corrector = corrector or AdvancedCorrector(**{**CORRECTOR_OPTIONS, "paragraph_store_path": None})
+        correction_pool = CorrectionPool(CORRECTION_WORKERS, CORRECTION_MAX_PENDING)
+        print("Logic Initialized Successfully.")
+    return global_corrector
+
+def warm_up():
+    """Menjalankan seluruh stage sekali (tanpa cache paragraf) sebelum worker menerima traffic."""
+    global warmup_report
+    started = time.perf_counter()
+    global_corrector.process_batch(WARMUP_TEXTS)
+    warmup_report = {"ms": round((time.perf_counter() - started) * 1000, 3), "texts": len(WARMUP_TEXTS)}
+    return warmup_report
+
+@asynccontextmanager
+async def lifespan(app):
+    # Server baru menerima koneksi setelah startup (termasuk warmup) selesai
+    global job_store, job_pool
+    await run_in_threadpool(initialize)
+    if PARAGRAPH_CACHE_PATH and global_corrector.paragraph_store is None:
+        global_corrector.open_paragraph_store(PARAGRAPH_CACHE_PATH)
+    if JOB_WORKERS > 0:
+        job_store = JobStore(JOBS_PATH)
+        if manage_job_workers:
+            job_pool = JobWorkerPool(JOBS_PATH, JOB_WORKERS, CORRECTOR_OPTIONS, retention=JOB_RETENTION_HOURS * 3600)
+            job_pool.start()
+    await run_in_threadpool(warm_up)
+    yield
+    if job_pool is not None:
+        await run_in_threadpool(job_pool.stop)
+        job_pool = None
+    if job_store is not None:
+        job_store.close()
+        job_store = None
 
 # APPLICATION SETUP
-app = FastAPI(title="Indonesian Text Correction API")
+app = FastAPI(title="Indonesian Text Correction API", lifespan=lifespan)
 
 # CORS CONFIGURATION
 app.add_middleware(
@@ -19,61 +112,271 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# SINGLETON MODEL INITIALIZATION
-print("Initializing Global Logic...")
-global_corrector = AdvancedCorrector()
-print("Logic Initialized Successfully.")
+# METRICS COLLECTORS (nilai gauge dibaca saat /metrics di-scrape)
+def collect_runtime_metrics():
+    pool = correction_pool.stats()
+    spelling = SPELLING_CACHE.stats()
+    paragraphs = PARAGRAPH_CACHE.stats()
+    gate = global_corrector.ner_gate_stats()
+    jobs = job_store.counts()["chunks"] if job_store else {}
+    return [
+        ("correction_pool_in_flight", "Pekerjaan koreksi yang sedang berjalan atau mengantre.", "gauge", pool["in_flight"]),
+        ("correction_pool_waiting", "Chunk streaming yang menunggu slot pool.", "gauge", pool["waiting"]),
+        ("correction_pool_rejected_total", "Request yang ditolak karena pool penuh (503).", "counter", pool["rejected"]),
+        ("spelling_cache_hits_total", "Cache hit keputusan ejaan.", "counter", spelling["hits"]),
+        ("spelling_cache_misses_total", "Cache miss keputusan ejaan.", "counter", spelling["misses"]),
+        ("paragraph_cache_hits_total", "Cache hit paragraf (memori).", "counter", paragraphs["hits"]),
+        ("paragraph_cache_misses_total", "Cache miss paragraf (memori).", "counter", paragraphs["misses"]),
+        ("ner_gate_sentences_total", "Kalimat yang diperiksa gate NER.", "counter", gate["sentences"]),
+        ("ner_gate_skipped_total", "Kalimat yang tidak dikirim ke model NER.", "counter", gate["skipped"]),
+        ("job_chunks_pending", "Chunk job yang menunggu worker.", "gauge", jobs.get("pending", 0)),
+        ("job_chunks_running", "Chunk job yang sedang dikoreksi.", "gauge", jobs.get("running", 0)),
+    ]
+
+REGISTRY.add_collector(collect_runtime_metrics)
 
 # DATA MODELS
 class TextRequest(BaseModel):
     text: str
 
+class BatchRequest(BaseModel):
+    texts: List[str]
+
+# HELPERS
+async def run_in_pool(fn, *args):
+    try:
+        return await correction_pool.run(fn, *args)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry later.", headers={"Retry-After": "1"})
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+def require_job_store():
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job workers are disabled (JOB_WORKERS=0).")
+    return job_store
+
+def parse_upload(filename, content):
+    if filename.endswith(".txt"):
+        return parse_txt(content)
+    elif filename.endswith(".pdf"):
+        return parse_pdf(content)
+    return parse_docx(content)
+
 # ROUTES
 @app.get("/")
 def health_check():
     return {"status": "active", "message": "Service is running."}
 
+@app.get("/ready")
+def readiness():
+    """200 jika worker ini sudah memuat model dan selesai warmup; 503 jika belum."""
+    if warmup_report is None:
+        raise HTTPException(status_code=503, detail="Service is warming up.")
+    return {"status": "ready", "pid": os.getpid(), "warmup": warmup_report}
+
+@app.post("/warmup")
+async def warmup():
+    """Menjalankan ulang warmup di worker yang menerima request ini."""
+    return await run_in_pool(warm_up)
+
+@app.get("/stats/ner")
+def ner_stats():
+    if not global_corrector.ner_batcher:
+        raise HTTPException(status_code=503, detail="NER model is not loaded.")
+    return {**global_corrector.ner_batcher.stats(), "gate": global_corrector.ner_gate_stats()}
+
+@app.get("/stats/pool")
+def pool_stats():
+    return correction_pool.stats()
+
+@app.get("/stats/cache")
+def cache_stats():
+    return SPELLING_CACHE.stats()
+
+@app.get("/stats/paragraph-cache")
+def paragraph_cache_stats():
+    store = global_corrector.paragraph_store
+    return {"memory": PARAGRAPH_CACHE.stats(), "disk": store.stats() if store else None}
+
+@app.get("/stats/jobs")
+def job_stats():
+    store = require_job_store()
+    # Pada mode preload, proses worker job dikelola master; worker HTTP hanya melihat antrean
+    return job_pool.stats() if job_pool else store.counts()
+
+@app.get("/metrics")
+def metrics():
+    """Histogram latensi dan counter dalam format teks Prometheus."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/correct-raw")
-async def correct_raw_text(request: TextRequest):
+async def correct_raw_text(request: TextRequest, timings: bool = Query(False)):
     if not request.text:
         raise HTTPException(status_code=400, detail="Input text cannot be empty.")
     
-    corrected_text = global_corrector.process(request.text)
-    logs = global_corrector.changes_log
+    result = await run_in_pool(global_corrector.process, request.text, timings)
     
-    return {
+    response = {
         "original": request.text,
-        "corrected": corrected_text,
-        "logs": logs
+        "corrected": result.text,
+        "logs": result.changes
+    }
+    if timings: response["timings"] = result.timings
+    return response
+
+@app.post("/correct-batch")
+async def correct_batch(request: BatchRequest, timings: bool = Query(False)):
+    """Koreksi banyak teks pendek dalam satu request; hasil mengikuti urutan input."""
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="Input texts cannot be empty.")
+    if len(request.texts) > CORRECTION_MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch is limited to {CORRECTION_MAX_BATCH_ITEMS} texts.")
+
+    results = await run_in_pool(global_corrector.process_batch, request.texts, timings)
+
+    response = {
+        "count": len(results),
+        "results": [
+            {"original": text, "corrected": result.text, "logs": result.changes}
+            for text, result in zip(request.texts, results)
+        ]
     }
+    if timings: response["timings"] = results[0].timings
+    return response
 
 @app.post("/correct-file")
-async def correct_file(file: UploadFile = File(...)):
+async def correct_file(file: UploadFile = File(...), timings: bool = Query(False)):
     filename = file.filename.lower()
+    if not filename.endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Unsupported file format. Please use .txt, .pdf, or .docx")
     content = await file.read()
-    raw_text = ""
 
     try:
-        if filename.endswith(".txt"):
-            raw_text = parse_txt(content)
-        elif filename.endswith(".pdf"):
-            raw_text = parse_pdf(content)
-        elif filename.endswith(".docx"):
-            raw_text = parse_docx(content)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Please use .txt, .pdf, or .docx")
+        parse_started = time.perf_counter()
+        raw_text = await run_in_pool(parse_upload, filename, content)
+        parse_ms = (time.perf_counter() - parse_started) * 1000
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File parsing error: {str(e)}")
 
     if not raw_text.strip():
         raise HTTPException(status_code=400, detail="File is empty or could not be read.")
 
-    corrected_text = global_corrector.process(raw_text)
-    logs = global_corrector.changes_log
+    result = await run_in_pool(global_corrector.process, raw_text, timings)
 
-    return {
+    response = {
         "filename": file.filename,
         "original_preview": raw_text[:500],
-        "corrected": corrected_text,
-        "logs": logs
-    }
\ No newline at end of file
+        "corrected": result.text,
+        "logs": result.changes
+    }
+    if timings: response["timings"] = {**result.timings, "parse_ms": round(parse_ms, 3)}
+    return response
+
+@app.post("/correct-file/stream")
+async def correct_file_stream(file: UploadFile = File(...), format: str = Query("ndjson", pattern="^(ndjson|sse)$")):
+    """
+    Koreksi per halaman (PDF) atau per kelompok paragraf (TXT/DOCX).
+    Setiap chunk dikoreksi begitu selesai diparsing dan langsung dikirim sebagai
+    record NDJSON atau Server-Sent Events, sehingga memori dibatasi ukuran chunk.
+    """
+    filename = file.filename.lower()
+    if not filename.endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Unsupported file format. Please use .txt, .pdf, or .docx")
+
+    # Upload dibaca dari file sementara milik UploadFile, tidak dimuat utuh ke memori
+    try:
+        chunks = await run_in_pool(iter_chunks, filename, file.file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"File parsing error: {str(e)}")
+
+    def encode(event, record):
+        payload = json.dumps(record, ensure_ascii=False)
+        if format == "sse":
+            return f"event: {event}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    async def records():
+        index, start = 0, None
+        try:
+            while True:
+                chunk = await correction_pool.run(next, chunks, None, wait=True)
+                if chunk is None: break
+                text, sep = chunk
+                # Chunk tanpa kata tetap dikirim agar original + sep dapat disusun ulang menjadi file asli
+                corrected, logs = text, []
+                if text.strip():
+                    result = await correction_pool.run(global_corrector.process, text, False, start, wait=True)
+                    corrected, logs = result.text, result.changes
+                yield encode("chunk", {"index": index, "original": text, "corrected": corrected, "sep": sep, "logs": logs})
+                start = next_sentence_start(text, sep, start)
+                index += 1
+        except Exception as e:
+            yield encode("error", {"error": f"Correction error: {str(e)}"})
+            return
+        yield encode("done", {"filename": file.filename, "chunks": index})
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(records(), media_type=media_type)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """
+    Antrekan koreksi dokumen panjang; respons langsung berisi id job.
+    Dokumen diparsing dan dikoreksi per chunk oleh proses worker.
+    """
+    store = require_job_store()
+    filename = file.filename.lower()
+    if not filename.endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Unsupported file format. Please use .txt, .pdf, or .docx")
+    content = await file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="File is empty or could not be read.")
+
+    job_id = await run_in_threadpool(store.submit, file.filename, content)
+    return {"id": job_id, "status": JOB_QUEUED}
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    store = require_job_store()
+    try:
+        return store.status(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    store = require_job_store()
+    try:
+        job, chunks = store.result(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job["status"] != JOB_DONE:
+        detail = f"Job is {job['status']}." + (f" {job['error']}" if job["error"] else "")
+        raise HTTPException(status_code=409, detail=detail)
+
+    # Chunk digabung dengan pemisah aslinya sehingga hasil sama dengan /correct-file
+    original = "".join(chunk["original"] + chunk["sep"] for chunk in chunks)
+    return {
+        "id": job_id,
+        "filename": job["filename"],
+        "original_preview": original[:500],
+        "corrected": "".join(chunk["corrected"] + chunk["sep"] for chunk in chunks),
+        "logs": [log for chunk in chunks for log in chunk["logs"]],
+        "chunks": len(chunks),
+    }
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    store = require_job_store()
+    try:
+        status = store.cancel(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if status in JOB_FINISHED and status != JOB_CANCELLED:
+        raise HTTPException(status_code=409, detail=f"Job is already {status}.")
+    return {"id": job_id, "status": status}
@@ -0,0 +1,120 @@
+"""
+Mode serving produksi: preload-and-fork.
+
+Master memuat model NER dan indeks SymSpell sekali, memindahkan seluruh objek
+yang sudah ada ke generasi permanen GC (gc.freeze) agar siklus GC di worker
+tidak menulis ke header objek tersebut, lalu melakukan fork N worker uvicorn
+yang berbagi satu socket. Halaman memori model dibagi copy-on-write; setiap
+worker hanya menyalin halaman yang benar-benar ditulisnya. Worker menjalankan
+warmup di lifespan sebelum mulai menerima koneksi, dan worker yang mati
+di-fork ulang dari master (tanpa memuat ulang model).
+"""
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+import app.main as server
+from app.core.jobs import JobWorkerPool
+
+# Waktu tunggu worker berhenti dengan sendirinya sebelum di-kill (detik)
+GRACEFUL_TIMEOUT = 30.0
+
+
+def bind_socket(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock, host, port, preload, torch_threads):
+    """Isi proses worker setelah fork; tidak pernah kembali."""
+    status = 1
+    try:
+        # Grup proses sendiri: Ctrl+C hanya diterima master, yang meneruskan SIGTERM sekali ke setiap worker
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        if preload:
+            gc.enable()
+            server.global_corrector.after_fork(torch_threads)
+        config = uvicorn.Config(server.app, host=host, port=port, lifespan="on",
+                                timeout_graceful_shutdown=GRACEFUL_TIMEOUT)
+        uvicorn.Server(config).run(sockets=[sock])
+        status = 0
+    finally:
+        # os._exit: finalizer dan atexit milik master tidak dijalankan di worker
+        os._exit(status)
+
+
+def serve(host, port, workers, preload=True):
+    """
+    Menjalankan master dan N worker HTTP. preload=False membuat setiap worker
+    memuat model sendiri setelah fork (setara N proses independen), dipakai
+    sebagai pembanding memori oleh scripts.memory_report.
+    """
+    sock = bind_socket(host, port)
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    if preload:
+        # GC dimatikan selama memuat model dan dibekukan sebelum fork
+        gc.disable()
+        server.initialize()
+        server.global_corrector.before_fork()
+        gc.freeze()
+        print(f"[server] Preloaded model and dictionary in master {os.getpid()} ({gc.get_freeze_count()} objects frozen).")
+    server.manage_job_workers = False
+
+    def fork_worker():
+        pid = os.fork()
+        if pid == 0: run_worker(sock, host, port, preload, torch_threads)
+        return pid
+
+    children = {fork_worker() for _ in range(workers)}
+    print(f"[server] Forked {workers} worker(s) on http://{host}:{port}: {sorted(children)}")
+
+    # Worker job (/jobs) dikelola master agar tidak ikut dijalankan oleh setiap worker HTTP
+    job_pool = None
+    if server.JOB_WORKERS > 0:
+        job_pool = JobWorkerPool(server.JOBS_PATH, server.JOB_WORKERS, server.CORRECTOR_OPTIONS,
+                                 retention=server.JOB_RETENTION_HOURS * 3600)
+        job_pool.start(monitor=False)
+
+    stopping = []
+    def request_stop(signum, frame): stopping.append(signum)
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    while not stopping:
+        for pid in list(children):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if not done: continue
+            children.discard(pid)
+            if stopping: break
+            replacement = fork_worker()
+            children.add(replacement)
+            print(f"[server] Worker {pid} exited (status {status}); forked {replacement}.")
+        if job_pool is not None: job_pool.check()
+        time.sleep(0.5)
+
+    print("[server] Shutting down workers...")
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    deadline = time.monotonic() + GRACEFUL_TIMEOUT
+    while children and time.monotonic() < deadline:
+        for pid in list(children):
+            if os.waitpid(pid, os.WNOHANG)[0]: children.discard(pid)
+        time.sleep(0.1)
+    for pid in children:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    if job_pool is not None: job_pool.stop()
+    sock.close()
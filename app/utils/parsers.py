@@ -1,25 +1,124 @@
+import codecs
+import re
+from functools import wraps
 from io import BytesIO
 from pypdf import PdfReader
 from docx import Document
 
+from app.core.metrics import PARSE_SECONDS
+from app.core.paragraphs import PARAGRAPH_BREAK
+
+# Batas ukuran satu chunk (karakter) pada mode streaming
+STREAM_CHUNK_CHARS = 20000
+
+def _timed(fmt):
+    """Mencatat durasi parsing satu file ke histogram PARSE_SECONDS."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with PARSE_SECONDS.time(fmt): return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _timed_chunks(fmt, chunks):
+    """Mencatat durasi parsing setiap chunk streaming (label <format>_chunk)."""
+    label = f"{fmt}_chunk"
+    while True:
+        with PARSE_SECONDS.time(label): chunk = next(chunks, None)
+        if chunk is None: return
+        yield chunk
+
+@_timed("txt")
 def parse_txt(file_content: bytes) -> str:
     """Parses plain text content."""
     return file_content.decode("utf-8")
 
+@_timed("pdf")
 def parse_pdf(file_content: bytes) -> str:
     """Extracts text from a PDF file byte stream."""
-    reader = PdfReader(BytesIO(file_content))
-    text = ""
-    for page in reader.pages:
-        extracted = page.extract_text()
-        if extracted:
-            text += extracted + "\n"
-    return text
+    return "".join(page + "\n" for page in iter_pdf_pages(BytesIO(file_content)))
 
+@_timed("docx")
 def parse_docx(file_content: bytes) -> str:
     """Extracts text from a DOCX file byte stream."""
     doc = Document(BytesIO(file_content))
     full_text = []
     for para in doc.paragraphs:
         full_text.append(para.text)
-    return "\n".join(full_text)
\ No newline at end of file
+    return "\n".join(full_text)
+
+# STREAMING PARSERS
+# Chunk streaming berupa pasangan (text, sep): sep adalah spasi/baris kosong setelah text,
+# sehingga "".join(text + sep) sama persis dengan hasil parse_* untuk file yang sama.
+WHITESPACE = re.compile(r'\s+')
+
+def _iter_decoded(file_obj, block_size=1 << 16):
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        block = file_obj.read(block_size)
+        text = decoder.decode(block, final=not block)
+        if text: yield text
+        if not block: return
+
+def _cut(buffer, max_chars):
+    """
+    Memilih potongan pertama buffer dengan len(text + sep) <= max_chars: di batas
+    paragraf terakhir yang muat (sama dengan pemecahan paragraf pada process),
+    lalu di spasi terakhir, dan baru dipotong paksa jika tidak ada spasi sama sekali.
+    """
+    last = None
+    for match in PARAGRAPH_BREAK.finditer(buffer):
+        if match.end() > max_chars: break
+        last = match
+    if last is not None:
+        text = buffer[:last.start()].rstrip()
+        return text, buffer[len(text):last.end()]
+    head = buffer[:max_chars]
+    for match in WHITESPACE.finditer(head): last = match
+    if last is None: return head, ""
+    return head[:last.start()], last.group()
+
+def _iter_text_chunks(pieces, max_chars=STREAM_CHUNK_CHARS):
+    """Memecah aliran potongan teks menjadi chunk (text, sep); buffer tidak pernah jauh melebihi max_chars."""
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        while len(buffer) > max_chars:
+            text, sep = _cut(buffer, max_chars)
+            buffer = buffer[len(text) + len(sep):]
+            yield text, sep
+    if buffer:
+        text = buffer.rstrip()
+        yield text, buffer[len(text):]
+
+def iter_txt_chunks(file_obj, max_chars=STREAM_CHUNK_CHARS):
+    """Yields (text, sep) chunks of a UTF-8 text file object without reading it whole."""
+    return _iter_text_chunks(_iter_decoded(file_obj), max_chars)
+
+def iter_pdf_pages(file_obj):
+    """Yields the text of each PDF page that contains extractable text."""
+    # Reader dibuat segera agar file yang rusak langsung gagal sebelum streaming dimulai
+    reader = PdfReader(file_obj)
+    extracted_pages = (page.extract_text() for page in reader.pages)
+    return (extracted for extracted in extracted_pages if extracted)
+
+def iter_pdf_chunks(file_obj):
+    """Yields (text, sep) per PDF page, matching the page separators of parse_pdf."""
+    return ((page, "\n") for page in iter_pdf_pages(file_obj))
+
+def iter_docx_chunks(file_obj, max_chars=STREAM_CHUNK_CHARS):
+    """Yields (text, sep) groups of DOCX paragraphs (python-docx still loads the XML body at once)."""
+    doc = Document(file_obj)
+    def pieces():
+        for i, para in enumerate(doc.paragraphs):
+            if i: yield "\n"
+            yield para.text
+    return _iter_text_chunks(pieces(), max_chars)
+
+def iter_chunks(filename: str, file_obj):
+    """Selects the streaming parser for a file by its extension; yields (text, sep) chunks."""
+    if filename.endswith(".txt"):
+        return _timed_chunks("txt", iter_txt_chunks(file_obj))
+    elif filename.endswith(".pdf"):
+        return _timed_chunks("pdf", iter_pdf_chunks(file_obj))
+    return _timed_chunks("docx", iter_docx_chunks(file_obj))
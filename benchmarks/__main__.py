@@ -0,0 +1,103 @@
+"""
+Benchmark suite AdvancedCorrector.
+
+Mengukur setiap stage koreksi dan process() secara terpisah pada korpus
+sintetis deterministik (satu kalimat hingga 1 MB), serta endpoint HTTP
+secara in-process. Melaporkan min/p50/p99 latency, throughput, dan peak memory,
+lalu (opsional) membandingkan dengan baseline JSON; regresi membuat proses
+keluar dengan status non-zero.
+
+Usage:
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json [--tolerance 0.25]
+    python -m benchmarks --sizes sentence 10kb --cases stage:spelling process --ner model
+"""
+import argparse
+import json
+
+from app.core.corrector import DICTIONARY_MODES, AdvancedCorrector
+from app.core.ner import NER_ENGINES
+from benchmarks.corpus import SIZES, CorpusBuilder, CorpusConfig
+from benchmarks.runner import MIN_SECONDS, ROUNDS, build_cases, compare, environment, run_cases
+from benchmarks.stub_ner import StubNerPipeline
+
+
+def http_client_for(corrector):
+    """Klien HTTP in-process untuk app.main, memakai corrector benchmark (tanpa lifespan/warmup)."""
+    from fastapi.testclient import TestClient
+
+    import app.main as server
+
+    server.initialize(corrector)
+    return TestClient(server.app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Filter prefix nama case (mis. stage:spelling process http).")
+    parser.add_argument("--ner", choices=("stub", "model"), default="stub",
+                        help="stub: pengganti NER deterministik; model: model NER sungguhan.")
+    parser.add_argument("--engine", choices=NER_ENGINES, default="pytorch", help="Engine NER untuk --ner model.")
+    parser.add_argument("--ner-max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--dictionary-mode", choices=DICTIONARY_MODES, default="expanded")
+    parser.add_argument("--no-http", action="store_true", help="Lewati benchmark endpoint HTTP.")
+    parser.add_argument("--seed", type=int, default=CorpusConfig.seed)
+    parser.add_argument("--repeat-scale", type=float, default=1.0)
+    parser.add_argument("--min-seconds", type=float, default=MIN_SECONDS,
+                        help="Total waktu terukur minimum per case per ronde (menambah pengulangan untuk input kecil).")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Jumlah ronde; semua case dijalankan bergiliran tiap ronde.")
+    parser.add_argument("--output", help="Simpan hasil ke file JSON.")
+    parser.add_argument("--save-baseline", help="Simpan hasil sebagai baseline JSON.")
+    parser.add_argument("--baseline", help="Bandingkan dengan baseline JSON; keluar non-zero jika ada regresi.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Toleransi kenaikan min latency (0.25 = 25%%).")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Toleransi kenaikan peak memory.")
+    args = parser.parse_args()
+
+    corrector = AdvancedCorrector(
+        dictionary_mode=args.dictionary_mode,
+        ner_engine=args.engine,
+        ner_max_wait_ms=args.ner_max_wait_ms,
+        ner_pipeline=StubNerPipeline() if args.ner == "stub" else None,
+    )
+    print("Building synthetic corpus...")
+    builder = CorpusBuilder(CorpusConfig(seed=args.seed))
+    http_client = None if args.no_http else http_client_for(corrector)
+
+    cases = build_cases(corrector, builder, args.sizes, http_client)
+    if args.cases: cases = [case for case in cases if case.name.startswith(tuple(args.cases))]
+
+    print()
+    results = run_cases(cases, args.repeat_scale, args.min_seconds, args.rounds)
+    report = {
+        "meta": {
+            **environment(),
+            "ner": args.ner if args.ner == "stub" else f"model:{args.engine}",
+            "dictionary_mode": args.dictionary_mode,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+            print(f"Saved {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f: baseline = json.load(f)
+        if baseline.get("meta", {}).get("ner") != report["meta"]["ner"]:
+            print(f"Warning: baseline was recorded with ner={baseline.get('meta', {}).get('ner')}")
+        lines, regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+        print()
+        print(f"Comparison with {args.baseline}:")
+        for line in lines: print(line)
+        if regressions:
+            print()
+            for regression in regressions: print(f"REGRESSION {regression}")
+            raise SystemExit(f"{len(regressions)} performance regression(s) against {args.baseline}.")
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Korpus sintetis bahasa Indonesia yang deterministik untuk benchmark.
+
+Kosakata diambil dari sampel kata dasar (data/kata-dasar.txt) beserta bentuk
+turunannya dari apply_morphology. Kalimat disisipi kesalahan dengan rasio
+terkontrol: salah ketik, kesalahan KPST (mempukul, mentulis, ...),
+reduplikasi dengan spasi, angka, dan entitas (nama tempat gazetteer, nama
+orang, organisasi). Seed dan ukuran yang sama selalu menghasilkan teks yang sama.
+"""
+import random
+from dataclasses import dataclass
+
+from app.core.dictionary import ROOTS_FILENAME, read_roots
+from app.core.lexicon import get_manual_cities, get_provinces_and_islands
+from app.core.morphology import apply_morphology
+
+# Ukuran input (karakter) dari satu kalimat hingga 1 MB
+SIZES = {
+    "sentence": 120,
+    "paragraph": 1_000,
+    "10kb": 10_000,
+    "100kb": 100_000,
+    "1mb": 1_000_000,
+}
+
+PERSON_NAMES = ["budi santoso", "siti aminah", "dewi lestari", "joko widodo", "sri mulyani", "ahmad dahlan"]
+ORGANIZATIONS = ["bank indonesia", "universitas gadjah mada", "pos indonesia", "telkom indonesia"]
+FUNCTION_WORDS = ["dan", "di", "ke", "dari", "yang", "untuk", "dengan", "pada", "itu", "ini", "akan", "sudah"]
+
+# Awalan yang salah untuk kata dasar berawalan p/t/s/k + vokal (lihat KPST_RULES)
+KPST_WRONG_PREFIX = {"p": "mem", "t": "men", "s": "men", "k": "meng"}
+
+
+@dataclass(frozen=True)
+class CorpusConfig:
+    seed: int = 1337
+    vocabulary_roots: int = 2000
+    typo_rate: float = 0.05
+    kpst_rate: float = 0.01
+    reduplication_rate: float = 0.02
+    number_rate: float = 0.03
+    entity_rate: float = 0.04
+
+
+class CorpusBuilder:
+    """Pembuat dokumen sintetis; kosakata dibangun sekali per konfigurasi."""
+
+    def __init__(self, config=CorpusConfig(), roots_path=ROOTS_FILENAME):
+        self.config = config
+        rng = random.Random(config.seed)
+        roots = sorted(set(read_roots(roots_path)))
+        roots = [root for root in roots if root.isalpha() and len(root) >= 3]
+        sample = sorted(rng.sample(roots, min(config.vocabulary_roots, len(roots))))
+        self.words = []
+        for root in sample:
+            forms = sorted(apply_morphology(root))
+            self.words.append(root)
+            self.words.extend(rng.sample(forms, min(3, len(forms))))
+        self.kpst_roots = [root for root in sample if root[0] in KPST_WRONG_PREFIX and root[1] in "aiueo"]
+        self.places = sorted(set(get_manual_cities() + get_provinces_and_islands()))
+
+    def document(self, size_chars, seed=None):
+        """Dokumen berukuran kurang lebih size_chars: paragraf 3-8 kalimat, dipisah baris kosong."""
+        rng = random.Random(f"{self.config.seed}:{size_chars}:{seed}")
+        paragraphs, total = [], 0
+        while total < size_chars:
+            paragraph = " ".join(self.sentence(rng) for _ in range(rng.randint(3, 8)))
+            paragraphs.append(paragraph)
+            total += len(paragraph) + 2
+        text = "\n\n".join(paragraphs)
+        if len(text) > size_chars:
+            # Dipotong di akhir kalimat terdekat agar ukuran mendekati target
+            cut = text.rfind(". ", 0, size_chars)
+            text = text[:cut + 1] if cut > 0 else text[:size_chars]
+        return text
+
+    def sentences(self, count, seed=None):
+        rng = random.Random(f"{self.config.seed}:sentences:{count}:{seed}")
+        return [self.sentence(rng) for _ in range(count)]
+
+    def sentence(self, rng):
+        config = self.config
+        words = []
+        for _ in range(rng.randint(6, 18)):
+            roll = rng.random()
+            if roll < config.entity_rate:
+                words.append(rng.choice(self.places + PERSON_NAMES + ORGANIZATIONS))
+            elif roll < config.entity_rate + config.number_rate:
+                words.append(self._number(rng))
+            elif roll < config.entity_rate + config.number_rate + config.kpst_rate and self.kpst_roots:
+                root = rng.choice(self.kpst_roots)
+                words.append(KPST_WRONG_PREFIX[root[0]] + root)
+            elif roll < config.entity_rate + config.number_rate + config.kpst_rate + config.reduplication_rate:
+                word = rng.choice(self.words)
+                words.append(f"{word} {word}")
+            else:
+                word = rng.choice(self.words) if rng.random() < 0.7 else rng.choice(FUNCTION_WORDS)
+                if rng.random() < config.typo_rate: word = self._typo(rng, word)
+                words.append(word)
+            if rng.random() < 0.08: words[-1] += ","
+        return " ".join(words) + rng.choice([".", ".", ".", "?", "!"])
+
+    def _number(self, rng):
+        kind = rng.random()
+        if kind < 0.4: return str(rng.randint(1, 9))
+        if kind < 0.7: return str(rng.randint(1, 999) * 1000)
+        if kind < 0.85: return f"{rng.randint(1, 99)}.{rng.randint(0, 999):03d}.000"
+        return f"{rng.randint(1, 9)}, {rng.randint(1, 9)} dan {rng.randint(1, 9)}"
+
+    def _typo(self, rng, word):
+        if len(word) < 4: return word
+        i = rng.randrange(1, len(word) - 1)
+        op = rng.randrange(4)
+        if op == 0: return word[:i] + word[i + 1:]
+        if op == 1: return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+        if op == 2: return word[:i] + rng.choice("aiueonrstkml") + word[i + 1:]
+        return word[:i] + word[i] + word[i:]
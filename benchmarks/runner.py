@@ -0,0 +1,190 @@
+import contextlib
+import io
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from app.core.cache import PARAGRAPH_CACHE
+from benchmarks.corpus import SIZES
+
+# Jumlah pengulangan minimum per ukuran input per ronde (dikalikan --repeat-scale);
+# pengukuran diulang sampai waktu terukur per ronde mencapai MIN_SECONDS, paling banyak
+# MAX_REPEAT_FACTOR kali minimum. Semua case dijalankan bergiliran sebanyak ROUNDS ronde
+# sehingga perlambatan sesaat pada mesin tidak mengenai semua sampel satu case.
+REPEATS = {"sentence": 200, "paragraph": 50, "10kb": 10, "100kb": 3, "1mb": 1}
+MIN_SECONDS = 0.3
+MAX_REPEAT_FACTOR = 20
+ROUNDS = 3
+
+# Perbedaan di bawah ambang ini dianggap noise, bukan regresi
+MIN_DELTA_MS = 0.05
+MIN_DELTA_KIB = 64
+
+STAGES = ("ner", "punctuation", "reduplication", "kpst", "spelling", "numbers", "capitalization")
+HTTP_SIZES = ("sentence", "paragraph", "10kb", "100kb")
+HTTP_BATCH_ITEMS = 100
+
+
+class Case:
+    """Satu benchmark: fn() diukur, setup() dijalankan sebelum setiap pengukuran (tidak diukur)."""
+
+    def __init__(self, name, size, chars, fn, setup=None):
+        self.name = name
+        self.size = size
+        self.chars = chars
+        self.fn = fn
+        self.setup = setup
+
+    @property
+    def key(self):
+        return f"{self.name}@{self.size}"
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def sample(case, repeats, min_seconds=MIN_SECONDS):
+    """Latensi (detik) minimal repeats kali dan sampai total waktu terukur mencapai min_seconds."""
+    if case.setup: case.setup()
+    case.fn()  # warmup
+    latencies = []
+    total = 0.0
+    while len(latencies) < repeats or (total < min_seconds and len(latencies) < repeats * MAX_REPEAT_FACTOR):
+        if case.setup: case.setup()
+        started = time.perf_counter()
+        case.fn()
+        elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        total += elapsed
+    return latencies
+
+
+def peak_memory(case):
+    """Alokasi Python tertinggi selama satu panggilan, diukur terpisah dengan tracemalloc."""
+    if case.setup: case.setup()
+    tracemalloc.start()
+    case.fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def summarize(case, latencies, peak):
+    latencies = sorted(latencies)
+    mean = statistics.fmean(latencies)
+    return {
+        "case": case.name,
+        "size": case.size,
+        "chars": case.chars,
+        "repeats": len(latencies),
+        "min_ms": latencies[0] * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "calls_per_s": 1 / mean if mean else 0.0,
+        "chars_per_s": case.chars / mean if mean else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+
+def build_cases(corrector, builder, sizes, http_client=None):
+    cases = []
+    clear_paragraphs = PARAGRAPH_CACHE.clear
+    for size in sizes:
+        text = builder.document(SIZES[size])
+        entities = corrector._find_entities([text])[0]
+        stage_fns = {
+            "ner": lambda t=text: corrector._find_entities([t]),
+            "punctuation": lambda t=text: corrector.fix_punctuation_spacing(t),
+            "reduplication": lambda t=text: corrector.fix_reduplication(t),
+            "kpst": lambda t=text: corrector.fix_kpst_correction_pre(t),
+            "spelling": lambda t=text, e=entities: corrector.fix_spelling_advanced(t, e),
+            "numbers": lambda t=text: corrector.fix_numbers_eyd(t),
+            "capitalization": lambda t=text, e=entities: corrector.fix_capitalization_ner(t, e),
+        }
+        for stage in STAGES:
+            cases.append(Case(f"stage:{stage}", size, len(text), stage_fns[stage]))
+        # Cache paragraf dikosongkan agar process() benar-benar menjalankan pipeline
+        cases.append(Case("process", size, len(text), lambda t=text: corrector.process(t), setup=clear_paragraphs))
+        cases.append(Case("process:cached", size, len(text), lambda t=text: corrector.process(t)))
+
+        if http_client is not None and size in HTTP_SIZES:
+            cases.append(Case("http:correct-raw", size, len(text), setup=clear_paragraphs,
+                              fn=lambda t=text: http_client.post("/correct-raw", json={"text": t}).raise_for_status()))
+            upload = text.encode("utf-8")
+            cases.append(Case("http:correct-file", size, len(text), setup=clear_paragraphs, fn=lambda u=upload: (
+                http_client.post("/correct-file", files={"file": ("bench.txt", u, "text/plain")}).raise_for_status())))
+
+    if http_client is not None:
+        items = builder.sentences(HTTP_BATCH_ITEMS)
+        chars = sum(map(len, items))
+        cases.append(Case("http:correct-batch", f"{HTTP_BATCH_ITEMS}x", chars,
+                          lambda: http_client.post("/correct-batch", json={"texts": items}).raise_for_status()))
+    return cases
+
+
+def run_cases(cases, repeat_scale=1.0, min_seconds=MIN_SECONDS, rounds=ROUNDS, progress=True):
+    samples = {case.key: [] for case in cases}
+    for round_index in range(rounds):
+        if progress: print(f"Round {round_index + 1}/{rounds}...", flush=True)
+        for case in cases:
+            repeats = max(1, round(REPEATS.get(case.size, 10) * repeat_scale))
+            # Log per request dari corrector dibuang agar tidak ikut terukur
+            with contextlib.redirect_stdout(io.StringIO()):
+                samples[case.key].extend(sample(case, repeats, min_seconds))
+
+    if progress:
+        print()
+        print(format_header())
+    results = []
+    for case in cases:
+        with contextlib.redirect_stdout(io.StringIO()):
+            peak = peak_memory(case)
+        result = summarize(case, samples[case.key], peak)
+        results.append(result)
+        if progress: print(format_row(result), flush=True)
+    return results
+
+
+def environment():
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "processor": platform.processor()}
+
+
+def format_header():
+    return f"{'case':<22} {'size':<10} {'min ms':>10} {'p50 ms':>10} {'p99 ms':>10} {'calls/s':>10} {'MB/s':>8} {'peak KiB':>10}"
+
+
+def format_row(result):
+    return (f"{result['case']:<22} {result['size']:<10} {result['min_ms']:>10.3f} {result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f} "
+            f"{result['calls_per_s']:>10.1f} {result['chars_per_s'] / 1e6:>8.2f} {result['peak_kib']:>10.0f}")
+
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    """
+    Membandingkan hasil dengan baseline (key case@size). Latensi dibandingkan
+    memakai waktu tercepat (min_ms): noise dari proses lain hanya bisa menambah
+    waktu, sehingga min jauh lebih stabil daripada p50 antar run. Regresi jika
+    min latency atau peak memory melebihi baseline lebih dari toleransi (dan ambang noise).
+    Mengembalikan (baris laporan, daftar regresi).
+    """
+    base_results = {f"{r['case']}@{r['size']}": r for r in baseline.get("results", [])}
+    lines, regressions = [], []
+    for result in results:
+        key = f"{result['case']}@{result['size']}"
+        base = base_results.get(key)
+        if base is None:
+            lines.append(f"{key:<34} new (no baseline)")
+            continue
+        time_ratio = result["min_ms"] / base["min_ms"] if base["min_ms"] else 1.0
+        memory_ratio = result["peak_kib"] / base["peak_kib"] if base["peak_kib"] else 1.0
+        slower = (time_ratio > 1 + tolerance and result["min_ms"] - base["min_ms"] > MIN_DELTA_MS)
+        bigger = (memory_ratio > 1 + memory_tolerance and result["peak_kib"] - base["peak_kib"] > MIN_DELTA_KIB)
+        status = "REGRESSION" if slower or bigger else "ok"
+        if slower: regressions.append(f"{key}: min {base['min_ms']:.3f} -> {result['min_ms']:.3f} ms")
+        if bigger: regressions.append(f"{key}: peak {base['peak_kib']:.0f} -> {result['peak_kib']:.0f} KiB")
+        lines.append(f"{key:<34} min {time_ratio:>6.2f}x  peak {memory_ratio:>6.2f}x  {status}")
+    return lines, regressions
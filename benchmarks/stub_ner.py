@@ -0,0 +1,31 @@
+import re
+
+from app.core.lexicon import get_manual_cities, get_provinces_and_islands
+from benchmarks.corpus import ORGANIZATIONS, PERSON_NAMES
+
+
+class StubNerPipeline:
+    """
+    Pengganti pipeline token-classification untuk benchmark: mengenali daftar
+    entitas tetap dengan satu regex, dengan format keluaran yang sama
+    (aggregation_strategy="simple"). Menerima satu teks atau list teks.
+    """
+
+    def __init__(self):
+        labels = {name: "PER" for name in PERSON_NAMES}
+        labels.update({name: "ORG" for name in ORGANIZATIONS})
+        for place in get_manual_cities() + get_provinces_and_islands(): labels.setdefault(place, "LOC")
+        self.labels = labels
+        alternatives = sorted(labels, key=len, reverse=True)
+        self.pattern = re.compile(r'\b(?:' + "|".join(map(re.escape, alternatives)) + r')\b', re.IGNORECASE)
+
+    def __call__(self, inputs, batch_size=None):
+        if isinstance(inputs, list): return [self._entities(text) for text in inputs]
+        return self._entities(inputs)
+
+    def _entities(self, text):
+        return [
+            {"entity_group": self.labels[match.group().lower()], "score": 0.95, "word": match.group(),
+             "start": match.start(), "end": match.end()}
+            for match in self.pattern.finditer(text)
+        ]
@@ -2,15 +2,24 @@ import uvicorn
 import os
 
 # SERVER CONFIGURATION
-HOST = "0.0.0.0"
-PORT = 8080
+HOST = os.environ.get("HOST", "0.0.0.0")
+PORT = int(os.environ.get("PORT", "8080"))
 RELOAD = True
 
+# PRODUCTION MODE (SERVER_WORKERS > 1: master memuat model sekali lalu fork worker, lihat app/server.py)
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "1"))
+PRELOAD = os.environ.get("PRELOAD", "1") == "1"
+
 # APPLICATION ENTRY POINT
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app", 
-        host=HOST, 
-        port=PORT, 
-        reload=RELOAD
-    )
\ No newline at end of file
+    if SERVER_WORKERS > 1:
+        from app.server import serve
+
+        serve(HOST, PORT, SERVER_WORKERS, preload=PRELOAD)
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=HOST,
+            port=PORT,
+            reload=RELOAD
+        )
@@ -0,0 +1,79 @@
+"""
+Benchmark endpoint /correct-batch terhadap request /correct-raw satu per satu.
+
+Membuat sejumlah teks pendek sintetis (judul tiket / isian form, dengan
+duplikat dan salah ketik), lalu mengirimnya sekali sebagai satu request
+/correct-batch dan sekali sebagai request /correct-raw berurutan melalui
+klien HTTP in-process. Hasil kedua jalur juga dibandingkan per item.
+
+Usage:
+    python -m scripts.bench_batch [--items 10000] [--unique 2000]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from fastapi.testclient import TestClient
+
+import app.main as server
+
+SUBJECTS = ["laporan", "permohonan", "keluhan", "pengajuan", "perbaikan", "rapat"]
+TOPICS = ["jalan rusak", "anggaran pendidikan", "pembayaran pajak", "kartu keluarga", "jaringan internet", "air bersih"]
+PLACES = ["jakarta", "papua pegunungan", "jawa tengah", "kota bandung", "sulawesi tengah", "surabaya"]
+NAMES = ["budi santoso", "siti aminah", "andi", "dewi lestari", "joko widodo"]
+TYPOS = {"laporan": "laparan", "perbaikan": "perbaikn", "pembayaran": "pembayran", "anggaran": "angaran"}
+
+
+def make_items(count, unique, seed=0):
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(unique):
+        text = f"{rng.choice(SUBJECTS)} {rng.choice(TOPICS)} di {rng.choice(PLACES)} dari {rng.choice(NAMES)}"
+        if rng.random() < 0.3:
+            word = rng.choice(list(TYPOS))
+            text = text.replace(word, TYPOS[word])
+        if rng.random() < 0.2: text += f" nomor {rng.randint(1, 500)}"
+        pool.append(text)
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--unique", type=int, default=2000, help="Number of distinct texts in the batch.")
+    args = parser.parse_args()
+
+    items = make_items(args.items, args.unique)
+    server.initialize()
+    client = TestClient(server.app)
+
+    # Log per request dibuang agar tidak ikut terukur
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.post("/correct-raw", json={"text": items[0]})  # warmup
+
+        started = time.perf_counter()
+        singles = [client.post("/correct-raw", json={"text": text}).json() for text in items]
+        single_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = client.post("/correct-batch", json={"texts": items})
+        batch_s = time.perf_counter() - started
+    response.raise_for_status()
+    batched = response.json()["results"]
+
+    mismatches = sum(
+        single["corrected"] != item["corrected"] or single["logs"] != item["logs"]
+        for single, item in zip(singles, batched)
+    )
+    print(f"items: {len(items)}, unique: {len(set(items))}")
+    print(f"{'mode':<10} {'seconds':>10} {'items/s':>10}")
+    print(f"{'single':<10} {single_s:>10.2f} {len(items) / single_s:>10.1f}")
+    print(f"{'batch':<10} {batch_s:>10.2f} {len(items) / batch_s:>10.1f}")
+    print(f"speedup: {single_s / batch_s:.2f}x")
+    print(f"mismatched items: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
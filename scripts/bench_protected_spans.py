@@ -0,0 +1,88 @@
+"""
+Micro-benchmark pengecekan token terhadap span entitas yang dilindungi.
+
+Membandingkan pendekatan lama (set(range) per token x per entitas) dengan
+SpanIndex (bisect) dan SpanSweep (two-pointer) pada dokumen sintetis yang
+padat entitas.
+
+Usage:
+    python -m scripts.bench_protected_spans [--entities 2000] [--tokens-per-entity 6]
+"""
+import argparse
+import random
+import re
+import time
+
+from app.core.spans import SpanIndex
+
+
+def make_document(entities, tokens_per_entity, seed=0):
+    rng = random.Random(seed)
+    words = ["laporan", "proyek", "pemerintah", "kota", "budi", "santoso", "jakarta", "rapat", "anggaran", "di"]
+    parts, spans, pos = [], [], 0
+    for _ in range(entities):
+        for _ in range(tokens_per_entity):
+            word = rng.choice(words)
+            parts.append(word)
+            pos += len(word) + 1
+        name = f"{rng.choice(words)} {rng.choice(words)}"
+        spans.append((pos, pos + len(name)))
+        parts.append(name)
+        pos += len(name) + 1
+    return " ".join(parts), spans
+
+
+def tokens_of(text):
+    return [(m.start(), m.end()) for m in re.finditer(r'\S+', text)]
+
+
+def check_sets(tokens, spans):
+    ranges = [range(start, end) for start, end in spans]
+    result = []
+    for start, end in tokens:
+        is_protected = False
+        token_range = range(start, end)
+        for r in ranges:
+            if set(token_range).intersection(set(r)):
+                is_protected = True; break
+        result.append(is_protected)
+    return result
+
+
+def check_bisect(tokens, spans):
+    index = SpanIndex(spans)
+    return [index.overlaps(start, end) for start, end in tokens]
+
+
+def check_sweep(tokens, spans):
+    sweep = SpanIndex(spans).sweep()
+    return [sweep.overlaps(start, end) for start, end in tokens]
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--tokens-per-entity", type=int, default=6)
+    args = parser.parse_args()
+
+    text, spans = make_document(args.entities, args.tokens_per_entity)
+    tokens = tokens_of(text)
+    print(f"{len(tokens)} tokens, {len(spans)} protected spans, {len(text)} chars\n")
+
+    baseline_time, expected = timed(check_sets, tokens, spans)
+    print(f"{'method':<12} {'time':>10} {'speedup':>10}")
+    print(f"{'sets':<12} {baseline_time * 1000:>8.1f}ms {1.0:>9.1f}x")
+    for name, fn in (("bisect", check_bisect), ("sweep", check_sweep)):
+        elapsed, result = timed(fn, tokens, spans)
+        assert result == expected, f"{name} disagrees with the set-based check"
+        print(f"{name:<12} {elapsed * 1000:>8.1f}ms {baseline_time / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Build artefak kamus secara offline.
+
+Membaca daftar kata dasar dari file lokal, mengekspansi morfologi secara
+paralel (process pool), menulis kamus + manifest secara atomik, lalu
+(opsional) menyiapkan snapshot SymSpell. Build bersifat inkremental: hanya
+shard kata dasar yang berubah yang diekspansi ulang.
+
+Usage:
+    python -m scripts.build_dictionary [--roots data/kata-dasar.txt] [--mode all|expanded|roots]
+                                       [--workers N] [--force] [--no-snapshot]
+    python -m scripts.build_dictionary --download   # unduh kata-dasar.txt Sastrawi terlebih dahulu
+"""
+import argparse
+import os
+
+from app.core.dictionary import (
+    DEFAULT_SHARDS, EXPANDED_DICT_FILENAME, FREQUENT_FORMS_FILENAME, ROOT_DICT_FILENAME, ROOTS_FILENAME,
+    SHARD_DIR, build_expanded_dictionary, build_root_dictionary, load_manifest,
+)
+
+ROOT_WORDS_URL = "https://raw.githubusercontent.com/sastrawi/sastrawi/master/data/kata-dasar.txt"
+
+
+def download_roots(path):
+    import requests
+
+    print(f"Downloading root words from {ROOT_WORDS_URL}...")
+    r = requests.get(ROOT_WORDS_URL, timeout=60)
+    r.raise_for_status()
+    roots = [line.strip().lower() for line in r.text.splitlines() if line.strip()]
+    if not roots: raise SystemExit("Downloaded root word list is empty.")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(roots) + "\n")
+    os.replace(tmp_path, path)
+    print(f"Saved {len(roots)} root words to {path}")
+
+
+def build_snapshot(path):
+    from symspellpy import SymSpell
+    from app.core.corrector import SYMSPELL_MAX_EDIT_DISTANCE, SYMSPELL_PREFIX_LENGTH
+    from app.core.snapshot import load_symspell
+
+    sym_spell = SymSpell(max_dictionary_edit_distance=SYMSPELL_MAX_EDIT_DISTANCE, prefix_length=SYMSPELL_PREFIX_LENGTH)
+    load_symspell(sym_spell, path, SYMSPELL_MAX_EDIT_DISTANCE, SYMSPELL_PREFIX_LENGTH,
+                  content_sha256=load_manifest(path)["output_sha256"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roots", default=ROOTS_FILENAME)
+    parser.add_argument("--mode", choices=("all", "expanded", "roots"), default="all")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS)
+    parser.add_argument("--force", action="store_true", help="Regenerate every shard.")
+    parser.add_argument("--no-snapshot", action="store_true", help="Skip building the SymSpell snapshot.")
+    parser.add_argument("--download", action="store_true", help="Download the Sastrawi root list to --roots first.")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.roots) or ".", exist_ok=True)
+    if args.download: download_roots(args.roots)
+    if not os.path.exists(args.roots):
+        raise SystemExit(f"Root word list not found: {args.roots} (use --download to fetch it)")
+
+    outputs = []
+    if args.mode in ("all", "expanded"):
+        print("[expanded] Building Ultimate V7 Database (Suffix Stacking)...")
+        outputs.append(build_expanded_dictionary(args.roots, EXPANDED_DICT_FILENAME, SHARD_DIR,
+                                                 workers=args.workers, shards=args.shards, force=args.force))
+    if args.mode in ("all", "roots"):
+        print("[roots] Building root-only index...")
+        outputs.append(build_root_dictionary(args.roots, ROOT_DICT_FILENAME, FREQUENT_FORMS_FILENAME))
+
+    if not args.no_snapshot:
+        for path in outputs:
+            print(f"[snapshot] {path}")
+            build_snapshot(path)
+
+
+if __name__ == "__main__":
+    main()
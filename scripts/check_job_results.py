@@ -0,0 +1,97 @@
+"""
+Pemeriksaan hasil /jobs terhadap /correct-file.
+
+Mengirim dokumen yang sama (TXT dan PDF beberapa halaman) ke /correct-file
+dan /jobs pada server yang sedang berjalan (JOB_WORKERS > 0), menunggu job
+selesai, lalu memastikan corrected dan original_preview identik dan logs
+berisi perubahan yang sama. Urutan log hanya bisa berbeda untuk paragraf yang
+lebih panjang dari satu chunk, karena log diurutkan per stage di setiap chunk.
+
+Usage:
+    python -m scripts.check_job_results --url http://127.0.0.1:8080 [--pages 12] [--timeout 600]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import urllib.request
+
+from scripts.check_stream_roundtrip import WORDS, post_file, synthetic_cases
+
+
+def build_pdf(pages):
+    """PDF minimal (Helvetica, satu baris teks per Tj) dengan satu halaman per daftar baris."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {len(objects)} 0 R"
+                       f" /Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def pdf_pages(count, seed=7):
+    rng = random.Random(seed)
+    words = [word for word in WORDS if word.isascii()]
+    # Halaman bisa berakhir di tengah kalimat agar konteks awal kalimat antar halaman ikut diuji
+    return [[" ".join(rng.choice(words) for _ in range(rng.randint(4, 14))) for _ in range(rng.randint(5, 30))]
+            for _ in range(count)]
+
+
+def wait_for_job(url, job_id, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with urllib.request.urlopen(f"{url}/jobs/{job_id}", timeout=60) as response: status = json.load(response)
+        if status["status"] in ("done", "failed", "cancelled"): return status
+        time.sleep(0.5)
+    raise SystemExit(f"Job {job_id} did not finish within {timeout}s.")
+
+
+def compare(url, filename, content, timeout):
+    with post_file(url, "/correct-file", filename, content) as response: expected = json.load(response)
+    with post_file(url, "/jobs", filename, content) as response: job_id = json.load(response)["id"]
+    status = wait_for_job(url, job_id, timeout)
+    if status["status"] != "done": return f"{filename}: job {status['status']} ({status['error']})"
+    with urllib.request.urlopen(f"{url}/jobs/{job_id}/result", timeout=60) as response: result = json.load(response)
+    for field in ("corrected", "original_preview"):
+        if result[field] != expected[field]: return f"{filename}: {field} differs from /correct-file"
+    if sorted(map(json.dumps, result["logs"])) != sorted(map(json.dumps, expected["logs"])):
+        return f"{filename}: logs differ from /correct-file"
+    print(f"ok   {filename}: {result['chunks']} chunks, {len(result['logs'])} logs, identical to /correct-file")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Batas waktu per job (detik).")
+    args = parser.parse_args()
+    url = args.url.rstrip("/")
+
+    documents = {f"{name.replace(' ', '_')}.txt": text.encode("utf-8")
+                 for name, text in synthetic_cases().items() if text.strip()}
+    documents["pages.pdf"] = build_pdf(pdf_pages(args.pages))
+
+    failures = [failure for filename, content in documents.items()
+                if (failure := compare(url, filename, content, args.timeout))]
+    for failure in failures: print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Pemeriksaan round-trip chunk streaming.
+
+Memastikan "".join(original + sep) dari setiap chunk sama persis dengan teks
+hasil parse_* (TXT: isi file byte demi byte) dan tidak ada chunk yang melebihi
+batas ukuran. Tanpa --url, parser streaming diperiksa langsung untuk sejumlah
+kasus (baris kosong ganda, baris berisi spasi, CRLF, file tanpa baris baru,
+karakter multibyte di batas blok). Dengan --url, file yang sama dikirim ke
+/correct-file/stream milik server yang sedang berjalan.
+
+Usage:
+    python -m scripts.check_stream_roundtrip [--url http://127.0.0.1:8080] [--file path ...]
+"""
+import argparse
+import json
+import random
+import sys
+import urllib.request
+import uuid
+from io import BytesIO
+
+from app.utils.parsers import STREAM_CHUNK_CHARS, iter_txt_chunks
+
+WORDS = ["laporan", "kegiatan", "di", "jakarta", "tanggal", "5", "mei.", "proyek", "selesai!", "éàü", "日本"]
+
+
+def synthetic_cases(seed=13):
+    rng = random.Random(seed)
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    separators = ["\n\n", "\n\n\n", "\n   \n", "  \n\n  ", "\n", " \t", "\r\n\r\n"]
+    mixed = "".join(words(rng.randint(1, 40)) + rng.choice(separators) for _ in range(3000))
+    return {
+        "review example": "para satu.\n\npara dua\n\n\nPara tiga\n   \nempat\n",
+        "leading and trailing space": "\n\n  awal teks.\n\nakhir teks  \n\n\n",
+        "whitespace only": " \n\n \t\n",
+        "empty": "",
+        "no newline": words(20000),
+        "no whitespace": "x" * 70000,
+        "mixed separators": mixed,
+    }
+
+
+def check_chunks(name, text, chunks, max_chars):
+    rebuilt = "".join(original + sep for original, sep in chunks)
+    if rebuilt != text:
+        at = next((i for i, (a, b) in enumerate(zip(rebuilt, text)) if a != b), min(len(rebuilt), len(text)))
+        return f"{name}: rebuilt text differs at char {at} ({len(rebuilt)} vs {len(text)} chars)"
+    longest = max((len(original) + len(sep) for original, sep in chunks), default=0)
+    if max_chars and longest > max_chars:
+        return f"{name}: chunk of {longest} chars exceeds {max_chars}"
+    print(f"ok   {name}: {len(chunks)} chunks, longest {longest} chars")
+    return None
+
+
+def post_file(url, path, filename, content):
+    """Mengirim file sebagai multipart/form-data (field "file"); mengembalikan response terbuka."""
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    request = urllib.request.Request(f"{url.rstrip('/')}{path}", data=body,
+                                     headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    return urllib.request.urlopen(request, timeout=600)
+
+
+def stream_chunks(url, filename, content):
+    chunks = []
+    with post_file(url, "/correct-file/stream?format=ndjson", filename, content) as response:
+        for line in response:
+            record = json.loads(line)
+            if "error" in record: raise RuntimeError(record["error"])
+            if "index" in record: chunks.append((record["original"], record["sep"]))
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Server yang sedang berjalan; tanpa opsi ini parser diperiksa langsung.")
+    parser.add_argument("--file", nargs="*", default=[], help="File .txt tambahan yang diperiksa.")
+    parser.add_argument("--max-chars", type=int, default=1000, help="Ukuran chunk untuk pemeriksaan parser langsung.")
+    args = parser.parse_args()
+
+    cases = {name: text.encode("utf-8") for name, text in synthetic_cases().items()}
+    for path in args.file:
+        with open(path, "rb") as f: cases[path] = f.read()
+
+    failures = []
+    for name, content in cases.items():
+        text = content.decode("utf-8")
+        if args.url:
+            # Upload kosong tidak menghasilkan chunk sama sekali
+            chunks = stream_chunks(args.url, "roundtrip.txt", content) if content else []
+            failure = check_chunks(name, text, chunks, STREAM_CHUNK_CHARS)
+        else:
+            # Chunk kecil agar banyak titik potong diuji; kasus besar melewati beberapa blok baca 64 KiB
+            chunks = list(iter_txt_chunks(BytesIO(content), args.max_chars))
+            failure = check_chunks(name, text, chunks, args.max_chars)
+        if failure:
+            print(f"FAIL {failure}")
+            failures.append(failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Perbandingan MorphologyValidator dengan kamus hasil ekspansi penuh.
+
+Untuk setiap kata dasar, seluruh bentuk apply_morphology harus diterima
+validator (positif). Untuk setiap bentuk juga dibuat varian salah ketik
+(hapus huruf terakhir, tambah huruf, tukar dua huruf awal); keputusan
+validator harus sama dengan keanggotaan varian di kamus ekspansi (negatif).
+
+Usage:
+    python -m scripts.compare_morphology [--roots data/kata-dasar.txt] [--measure-index]
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.core.lexicon import get_extra_words
+from app.core.morphology import DICTIONARY_WORD_PATTERN, MorphologyValidator, apply_morphology
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+
+
+def variants(word):
+    yield word[:-1]
+    yield word + "x"
+    if len(word) > 2: yield word[1] + word[0] + word[2:]
+
+
+def measure_index(words):
+    from symspellpy import SymSpell
+    from app.core.corrector import SYMSPELL_MAX_EDIT_DISTANCE, SYMSPELL_PREFIX_LENGTH
+
+    before = rss_mb()
+    started = time.perf_counter()
+    sym_spell = SymSpell(max_dictionary_edit_distance=SYMSPELL_MAX_EDIT_DISTANCE, prefix_length=SYMSPELL_PREFIX_LENGTH)
+    for word in words: sym_spell.create_dictionary_entry(word, 1)
+    return time.perf_counter() - started, rss_mb() - before, sym_spell
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roots", default=os.path.join("data", "kata-dasar.txt"))
+    parser.add_argument("--measure-index", action="store_true", help="Also build both SymSpell indexes and report memory.")
+    args = parser.parse_args()
+
+    with open(args.roots, encoding="utf-8") as f:
+        roots = [line.strip().lower() for line in f if line.strip()]
+    extras = get_extra_words()
+
+    print(f"Expanding {len(roots)} root words...")
+    expanded = set()
+    for root in roots: expanded.update(apply_morphology(root))
+    expanded.update(extras)
+    expanded = {word for word in expanded if DICTIONARY_WORD_PATTERN.match(word)}
+
+    validator = MorphologyValidator(roots, extras, cache_size=None)
+    started = time.perf_counter()
+    false_rejects = [word for word in expanded if not validator.is_valid(word)]
+    negatives = 0
+    false_accepts = []
+    for word in expanded:
+        for variant in variants(word):
+            if variant in expanded: continue
+            negatives += 1
+            if validator.is_valid(variant): false_accepts.append(variant)
+    elapsed = time.perf_counter() - started
+
+    print(f"expanded forms:  {len(expanded)}")
+    print(f"negatives:       {negatives}")
+    print(f"false rejects:   {len(false_rejects)}  {sorted(false_rejects)[:10]}")
+    print(f"false accepts:   {len(false_accepts)}  {sorted(false_accepts)[:10]}")
+    print(f"validation time: {elapsed:.1f}s")
+
+    if args.measure_index:
+        root_index_words = {word for word in roots if DICTIONARY_WORD_PATTERN.match(word)} | validator.extras
+        root_time, root_mb, root_index = measure_index(root_index_words)
+        del root_index
+        full_time, full_mb, full_index = measure_index(expanded)
+        del full_index
+        print(f"\n{'index':<10} {'words':>10} {'build':>10} {'rss delta':>12}")
+        print(f"{'roots':<10} {len(root_index_words):>10} {root_time:>9.1f}s {root_mb:>9.1f} MB")
+        print(f"{'expanded':<10} {len(expanded):>10} {full_time:>9.1f}s {full_mb:>9.1f} MB")
+
+    sys.exit(1 if false_rejects or false_accepts else 0)
+
+
+if __name__ == "__main__":
+    main()
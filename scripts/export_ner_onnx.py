@@ -0,0 +1,31 @@
+"""
+Ekspor model NER ke ONNX secara offline.
+
+Menghasilkan graph ONNX fp32 di data/onnx/bert-base-indonesian-NER dan
+versi kuantisasi dinamis int8 di data/onnx/bert-base-indonesian-NER-int8,
+yang dipakai server lewat NER_ENGINE=onnx atau NER_ENGINE=onnx-int8.
+Membutuhkan optimum[onnxruntime] (tidak diperlukan saat engine pytorch).
+
+Usage:
+    python -m scripts.export_ner_onnx [--no-quantize]
+    python -m scripts.ner_fidelity    # cek kesesuaian entitas sebelum dipakai
+"""
+import argparse
+
+from app.core.ner import NER_MODEL_NAME, ONNX_DIR, ONNX_INT8_DIR, export_onnx
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=NER_MODEL_NAME)
+    parser.add_argument("--output-dir", default=ONNX_DIR)
+    parser.add_argument("--int8-dir", default=ONNX_INT8_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="Only export the fp32 ONNX graph.")
+    args = parser.parse_args()
+
+    export_onnx(args.model, args.output_dir, args.int8_dir, quantize=not args.no_quantize)
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Laporan memori per worker: N proses independen vs preload-and-fork.
+
+Menjalankan run.py dengan SERVER_WORKERS=N untuk setiap mode:
+- independent: PRELOAD=0, setiap worker memuat model dan kamus sendiri setelah fork
+- preload:     PRELOAD=1, model dimuat master lalu dibagi copy-on-write ke worker
+
+Setelah semua worker selesai warmup dan sejumlah request dikirim, memori master
+dan setiap worker dibaca dari /proc/<pid>/smaps_rollup:
+- USS (Private_Clean + Private_Dirty): memori yang hanya dimiliki proses itu
+- PSS: halaman bersama dibagi rata antar proses; total PSS = pemakaian RAM sebenarnya
+- RSS: termasuk seluruh halaman bersama
+
+Usage:
+    python -m scripts.memory_report --workers 4 [--requests 50] [--modes independent preload]
+"""
+import argparse
+import glob
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+RUN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run.py")
+MODES = {"independent": "0", "preload": "1"}
+SAMPLE_TEXT = "laporan dari budi santoso mengenai proyek di papua pegunungan, di hadiri 25 orang pada tanggal 5 mei."
+
+
+def smaps_rollup(pid):
+    """Field smaps_rollup dalam kB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB": values[parts[0].rstrip(":")] = int(parts[1])
+    return values
+
+
+def memory_mb(pid):
+    values = smaps_rollup(pid)
+    return {
+        "rss": values["Rss"] / 1024,
+        "pss": values["Pss"] / 1024,
+        "uss": (values["Private_Clean"] + values["Private_Dirty"]) / 1024,
+    }
+
+
+def child_pids(pid):
+    pids = set()
+    for path in glob.glob(f"/proc/{pid}/task/*/children"):
+        with open(path) as f: pids.update(int(child) for child in f.read().split())
+    return sorted(pids)
+
+
+def cpu_ticks(pids):
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += int(fields[11]) + int(fields[12])  # utime + stime
+        except FileNotFoundError:
+            pass
+    return total
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(port, path, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as response: return json.load(response)
+
+
+def wait_until_ready(process, port, workers, timeout):
+    """Menunggu N worker ada, /ready menjawab 200, dan seluruh worker diam (warmup selesai)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None: raise SystemExit(f"Server exited with status {process.returncode}.")
+        pids = child_pids(process.pid)
+        if len(pids) >= workers:
+            try:
+                request(port, "/ready")
+                wait_until_idle([process.pid] + pids)
+                return child_pids(process.pid)
+            except (urllib.error.URLError, ConnectionError):
+                pass
+        time.sleep(1.0)
+    raise SystemExit(f"Server was not ready within {timeout}s.")
+
+
+def wait_until_idle(pids, interval=1.0, rounds=2):
+    """Menunggu sampai waktu CPU proses tidak bertambah selama beberapa interval berturut-turut."""
+    idle, last = 0, cpu_ticks(pids)
+    while idle < rounds:
+        time.sleep(interval)
+        current = cpu_ticks(pids)
+        idle = idle + 1 if current - last <= 1 else 0
+        last = current
+
+
+def measure_mode(mode, workers, requests, timeout, log):
+    port = free_port()
+    env = {**os.environ, "SERVER_WORKERS": str(workers), "PRELOAD": MODES[mode], "PORT": str(port),
+           "HOST": "127.0.0.1", "JOB_WORKERS": "0"}
+    print(f"Starting {mode} server ({workers} workers, port {port})...")
+    process = subprocess.Popen([sys.executable, RUN_SCRIPT], env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        started = time.monotonic()
+        worker_pids = wait_until_ready(process, port, workers, timeout)
+        ready_s = time.monotonic() - started
+        for i in range(requests): request(port, "/correct-raw", {"text": f"{SAMPLE_TEXT} nomor {i}"})
+        wait_until_idle([process.pid] + worker_pids)
+        rows = [("master", process.pid, memory_mb(process.pid))]
+        rows += [("worker", pid, memory_mb(pid)) for pid in worker_pids]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"mode": mode, "ready_s": ready_s, "rows": rows}
+
+
+def print_report(report):
+    print()
+    print(f"{report['mode']} (ready after {report['ready_s']:.1f}s)")
+    print(f"{'process':<8} {'pid':>8} {'RSS MB':>10} {'PSS MB':>10} {'USS MB':>10}")
+    for role, pid, memory in report["rows"]:
+        print(f"{role:<8} {pid:>8} {memory['rss']:>10.1f} {memory['pss']:>10.1f} {memory['uss']:>10.1f}")
+    workers = [memory for role, _, memory in report["rows"] if role == "worker"]
+    report["worker_uss"] = sum(memory["uss"] for memory in workers) / len(workers)
+    report["total_pss"] = sum(memory["pss"] for _, _, memory in report["rows"])
+    print(f"avg worker USS: {report['worker_uss']:.1f} MB, total PSS: {report['total_pss']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50, help="Request /correct-raw sebelum memori diukur.")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--timeout", type=float, default=900.0, help="Batas waktu startup per mode (detik).")
+    parser.add_argument("--log", default=os.devnull, help="File log output server.")
+    args = parser.parse_args()
+    if args.workers < 2: parser.error("--workers must be at least 2 (one worker runs without fork).")
+
+    reports = []
+    with open(args.log, "a") as log:
+        for mode in args.modes:
+            report = measure_mode(mode, args.workers, args.requests, args.timeout, log)
+            print_report(report)
+            reports.append(report)
+
+    if len(reports) == 2:
+        before, after = reports
+        print()
+        print(f"worker USS: {before['worker_uss']:.1f} -> {after['worker_uss']:.1f} MB "
+              f"({after['worker_uss'] / before['worker_uss']:.2f}x)")
+        print(f"total PSS:  {before['total_pss']:.1f} -> {after['total_pss']:.1f} MB "
+              f"({after['total_pss'] / before['total_pss']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cek fidelitas engine NER terhadap model fp32 (pytorch).
+
+Menjalankan korpus kalimat tetap melalui setiap engine, lalu membandingkan
+entitas (start, end, entity_group) dengan keluaran pytorch fp32 sebagai
+acuan: precision/recall/F1 level entitas, persentase kalimat yang identik,
+dan latensi per kalimat. Hanya entitas dengan skor >= --min-score (sama
+dengan ambang kapitalisasi di corrector) yang dihitung.
+
+Usage:
+    python -m scripts.ner_fidelity [--engines onnx onnx-int8] [--min-score 0.5] [--min-f1 0.98]
+"""
+import argparse
+import statistics
+import time
+
+from app.core.ner import NER_ENGINES, load_ner_pipeline
+
+CORPUS = [
+    "laporan dari budi santoso mengenai proyek di papua pegunungan.",
+    "presiden joko widodo meresmikan bendungan di jawa tengah kemarin.",
+    "rapat dewan perwakilan rakyat membahas anggaran pendidikan tahun depan.",
+    "siti aminah bekerja di bank indonesia cabang surabaya sejak lama.",
+    "gempa bumi mengguncang wilayah sulawesi tengah pada pagi hari.",
+    "universitas gadjah mada membuka pendaftaran mahasiswa baru di yogyakarta.",
+    "pemerintah kota bandung memperbaiki jalan rusak di beberapa kecamatan.",
+    "tim nasional indonesia berlatih di stadion gelora bung karno jakarta.",
+    "menteri keuangan sri mulyani menghadiri pertemuan di washington.",
+    "pt pertamina membangun kilang baru di tuban jawa timur.",
+    "andi dan rina berlibur ke pulau bali bersama keluarga.",
+    "kantor gubernur sumatera utara berada di kota medan.",
+    "warga kalimantan barat merayakan hari jadi kota pontianak.",
+    "bapak ahmad dahlan mendirikan muhammadiyah di yogyakarta.",
+    "komisi pemberantasan korupsi memeriksa pejabat dinas pekerjaan umum.",
+    "kapal pelni berlayar dari makassar menuju ambon setiap minggu.",
+    "dewi lestari menulis novel yang diterbitkan di bandung.",
+    "bank rakyat indonesia membuka kantor cabang di nusa tenggara timur.",
+    "pertandingan persib melawan persija digelar di stadion si jalak harupat.",
+    "kepala badan meteorologi klimatologi dan geofisika memberi peringatan dini.",
+    "mahasiswa institut teknologi bandung memenangkan lomba robot di tokyo.",
+    "ibu kota nusantara dibangun di kalimantan timur.",
+    "rumah sakit cipto mangunkusumo menerima pasien rujukan dari bogor.",
+    "kereta cepat jakarta bandung mulai beroperasi tahun lalu.",
+    "bupati banyuwangi meninjau pelabuhan ketapang bersama kapolres.",
+    "lembaga ilmu pengetahuan indonesia meneliti flora di papua barat.",
+    "yusuf mengirim paket dari semarang ke palembang melalui pos indonesia.",
+    "festival danau toba diadakan di kabupaten samosir sumatera utara.",
+    "perusahaan telkom indonesia memperluas jaringan di maluku utara.",
+    "joko dan sari bertemu di alun alun kota malang kemarin sore.",
+]
+
+
+def entity_set(output, min_score):
+    return {(e["start"], e["end"], e["entity_group"]) for e in output if e["score"] >= min_score}
+
+
+def run_engine(ner, corpus, repeats):
+    ner(corpus[0])  # warmup
+    outputs, latencies = [], []
+    for _ in range(repeats):
+        outputs = []
+        for sentence in corpus:
+            started = time.perf_counter()
+            outputs.append(ner(sentence))
+            latencies.append(time.perf_counter() - started)
+    return outputs, latencies
+
+
+def compare(reference, candidate, min_score):
+    tp = fp = fn = identical = 0
+    for ref_out, cand_out in zip(reference, candidate):
+        ref, cand = entity_set(ref_out, min_score), entity_set(cand_out, min_score)
+        tp += len(ref & cand)
+        fp += len(cand - ref)
+        fn += len(ref - cand)
+        identical += ref == cand
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1, "identical": identical / len(reference)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", choices=NER_ENGINES[1:], default=list(NER_ENGINES[1:]))
+    parser.add_argument("--min-score", type=float, default=0.5)
+    parser.add_argument("--repeats", type=int, default=3, help="Latency repeats over the corpus.")
+    parser.add_argument("--min-f1", type=float, default=None, help="Exit non-zero if any engine falls below this F1.")
+    args = parser.parse_args()
+
+    print("Loading pytorch (fp32 reference)...")
+    reference, ref_latencies = run_engine(load_ner_pipeline("pytorch"), CORPUS, args.repeats)
+    rows = [("pytorch", {"precision": 1.0, "recall": 1.0, "f1": 1.0, "identical": 1.0}, ref_latencies)]
+    for engine in args.engines:
+        print(f"Loading {engine}...")
+        outputs, latencies = run_engine(load_ner_pipeline(engine), CORPUS, args.repeats)
+        rows.append((engine, compare(reference, outputs, args.min_score), latencies))
+
+    ref_p50 = statistics.median(ref_latencies)
+    print()
+    print(f"{'engine':<10} {'prec':>7} {'recall':>7} {'f1':>7} {'ident':>7} {'p50 ms':>8} {'speedup':>8}")
+    failed = False
+    for engine, scores, latencies in rows:
+        p50 = statistics.median(latencies)
+        print(f"{engine:<10} {scores['precision']:>7.3f} {scores['recall']:>7.3f} {scores['f1']:>7.3f} "
+              f"{scores['identical']:>7.1%} {p50 * 1000:>8.2f} {ref_p50 / p50:>7.2f}x")
+        if args.min_f1 is not None and scores["f1"] < args.min_f1: failed = True
+    if failed: raise SystemExit(f"Entity F1 below {args.min_f1}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Laporan gate NER dan gazetteer.
+
+Mengoreksi korpus yang sama dua kali dengan satu instance corrector:
+jalur acuan (NER di setiap kalimat, tanpa gazetteer) dan jalur gate
+(gazetteer + NER hanya untuk kalimat dengan token tidak dikenal, huruf
+kapital di tengah kalimat, atau nama tempat ambigu). Melaporkan fraksi
+kalimat yang melewati inferensi, persentase teks hasil yang identik,
+kesesuaian log kapitalisasi (precision/recall terhadap jalur acuan),
+dan waktu total masing-masing jalur.
+
+Usage:
+    python -m scripts.ner_gate_report [--file corpus.txt] [--dictionary-mode roots] [--engine onnx-int8] [--min-identical 0.95]
+"""
+import argparse
+import time
+from collections import Counter
+
+from app.core.corrector import DICTIONARY_MODES, AdvancedCorrector
+from app.core.ner import NER_ENGINES
+from scripts.ner_fidelity import CORPUS
+
+# Kalimat tanpa entitas: seharusnya dilewati gate
+PLAIN_SENTENCES = [
+    "hari ini cuaca sangat cerah dan kami pergi ke pasar.",
+    "anak anak bermain bola di lapangan setelah pulang sekolah.",
+    "ibu memasak nasi goreng untuk sarapan pagi.",
+    "harga beras naik sejak awal bulan ini.",
+    "mereka belajar bersama di perpustakaan sampai sore.",
+    "jalan di depan rumah kami sedang diperbaiki.",
+    "saya membaca buku cerita sebelum tidur.",
+    "kucing itu tidur di atas kursi kayu.",
+    "petani menanam padi ketika musim hujan tiba.",
+    "guru memberikan tugas rumah kepada murid murid.",
+]
+
+
+def capitalization_logs(result):
+    return Counter((c["Original"], c["Fixed"]) for c in result.changes if c["Type"].startswith("Capitalization"))
+
+
+def run(corrector, texts, gate, gazetteer):
+    corrector.ner_gate = gate
+    corrector.gazetteer = gazetteer
+    before = corrector.ner_gate_stats()
+    started = time.perf_counter()
+    results = corrector.process_batch(texts)
+    elapsed = time.perf_counter() - started
+    after = corrector.ner_gate_stats()
+    return results, elapsed, after["sentences"] - before["sentences"], after["skipped"] - before["skipped"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="Korpus teks, satu dokumen per baris (default: korpus bawaan).")
+    parser.add_argument("--dictionary-mode", choices=DICTIONARY_MODES, default="expanded")
+    parser.add_argument("--engine", choices=NER_ENGINES, default="pytorch")
+    parser.add_argument("--min-identical", type=float, default=None,
+                        help="Exit non-zero if the identical-output fraction falls below this value.")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f: texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = CORPUS + PLAIN_SENTENCES
+
+    corrector = AdvancedCorrector(dictionary_mode=args.dictionary_mode, ner_engine=args.engine)
+    if not corrector.ner_pipeline: raise SystemExit("NER model is not loaded.")
+    gazetteer = corrector.gazetteer
+    corrector.process_batch(texts[:1])  # warmup
+
+    reference, ref_time, _, _ = run(corrector, texts, gate=False, gazetteer=None)
+    gated, gated_time, sentences, skipped = run(corrector, texts, gate=True, gazetteer=gazetteer)
+
+    tp = fp = fn = identical = 0
+    for ref, cand in zip(reference, gated):
+        ref_logs, cand_logs = capitalization_logs(ref), capitalization_logs(cand)
+        tp += sum((ref_logs & cand_logs).values())
+        fp += sum((cand_logs - ref_logs).values())
+        fn += sum((ref_logs - cand_logs).values())
+        identical += ref.text == cand.text
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    identical_rate = identical / len(texts)
+
+    print()
+    print(f"documents:            {len(texts)}")
+    print(f"sentences:            {sentences}")
+    print(f"skipped NER:          {skipped} ({skipped / sentences:.1%})" if sentences else "skipped NER:          0")
+    print(f"identical output:     {identical_rate:.1%}")
+    print(f"capitalization logs:  precision {precision:.3f}, recall {recall:.3f} (vs always-NER)")
+    print(f"time always-NER:      {ref_time * 1000:.1f} ms")
+    print(f"time gated:           {gated_time * 1000:.1f} ms ({ref_time / gated_time:.2f}x)")
+    if args.min_identical is not None and identical_rate < args.min_identical:
+        raise SystemExit(f"Identical output below {args.min_identical:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
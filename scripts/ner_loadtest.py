@@ -0,0 +1,96 @@
+"""
+Load generator untuk NER micro-batching.
+
+Menjalankan sejumlah client konkuren yang masing-masing mengirim dokumen
+berisi beberapa kalimat, sekali tanpa batching (batch size 1 per kalimat)
+dan sekali melalui NerBatcher, lalu membandingkan throughput.
+
+Usage:
+    python -m scripts.ner_loadtest --clients 8 --requests 20 --max-batch-size 16 --max-wait-ms 5
+"""
+import argparse
+import threading
+import time
+
+from app.core.batching import NerBatcher
+from app.core.ner import NER_ENGINES, NER_MODEL_NAME, load_ner_pipeline
+
+SENTENCES = [
+    "laporan dari budi santoso mengenai proyek di papua pegunungan.",
+    "presiden joko widodo meresmikan bendungan di jawa tengah kemarin.",
+    "rapat dewan perwakilan rakyat membahas anggaran pendidikan tahun depan.",
+    "siti aminah bekerja di bank indonesia cabang surabaya sejak lama.",
+    "gempa bumi mengguncang wilayah sulawesi tengah pada pagi hari.",
+    "universitas gadjah mada membuka pendaftaran mahasiswa baru di yogyakarta.",
+    "pemerintah kota bandung memperbaiki jalan rusak di beberapa kecamatan.",
+    "tim nasional indonesia berlatih di stadion gelora bung karno jakarta.",
+]
+
+
+def run_load(run_document, clients, requests_per_client, sentences_per_request):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(client_id):
+        for i in range(requests_per_client):
+            offset = (client_id + i) % len(SENTENCES)
+            document = [SENTENCES[(offset + k) % len(SENTENCES)] for k in range(sentences_per_request)]
+            started = time.perf_counter()
+            run_document(document)
+            elapsed = time.perf_counter() - started
+            with lock: latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    started = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    total_sentences = clients * requests_per_client * sentences_per_request
+    return {
+        "wall_s": wall,
+        "sentences_per_s": total_sentences / wall,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client.")
+    parser.add_argument("--sentences", type=int, default=4, help="Sentences per request.")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--engine", choices=NER_ENGINES, default="pytorch")
+    args = parser.parse_args()
+
+    print(f"Loading {NER_MODEL_NAME} ({args.engine})...")
+    ner = load_ner_pipeline(args.engine)
+    ner(SENTENCES[0])  # warmup
+
+    def unbatched(document):
+        return [ner(sentence) for sentence in document]
+
+    print("Running unbatched load...")
+    baseline = run_load(unbatched, args.clients, args.requests, args.sentences)
+
+    batcher = NerBatcher(ner, args.max_batch_size, args.max_wait_ms)
+    print("Running batched load...")
+    batched = run_load(batcher.submit, args.clients, args.requests, args.sentences)
+    stats = batcher.stats()
+    batcher.close()
+
+    print()
+    print(f"{'mode':<10} {'sent/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for name, result in (("unbatched", baseline), ("batched", batched)):
+        print(f"{name:<10} {result['sentences_per_s']:>10.1f} {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}")
+    print()
+    print(f"speedup: {batched['sentences_per_s'] / baseline['sentences_per_s']:.2f}x")
+    print(f"batches: {stats['batches']}, avg batch size: {stats['avg_batch_size']:.2f}, "
+          f"fill ratio: {stats['batch_fill_ratio']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
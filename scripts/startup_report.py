@@ -0,0 +1,80 @@
+"""
+Laporan waktu startup indeks SymSpell.
+
+Membandingkan tiga cara memuat indeks:
+- text:     SymSpell.load_dictionary dari kamus teks (membangun ulang deletes index)
+- snapshot: load pertama dari snapshot biner (SymSpell.load_pickle tanpa kompresi)
+- warm:     load kedua dari snapshot (page cache sudah hangat)
+
+Usage:
+    python -m scripts.startup_report [--dictionary data/full_dictionary_v7_suffix_stacking.txt]
+"""
+import argparse
+import gc
+import os
+import resource
+import time
+
+from symspellpy import SymSpell
+
+from app.core.corrector import SYMSPELL_MAX_EDIT_DISTANCE, SYMSPELL_PREFIX_LENGTH
+from app.core.snapshot import load_snapshot, save_snapshot, snapshot_key, snapshot_path_for
+
+
+def new_symspell():
+    return SymSpell(max_dictionary_edit_distance=SYMSPELL_MAX_EDIT_DISTANCE, prefix_length=SYMSPELL_PREFIX_LENGTH)
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+
+
+def measure(label, load):
+    gc.collect()
+    before = rss_mb()
+    started = time.perf_counter()
+    sym_spell = load()
+    elapsed = time.perf_counter() - started
+    after = rss_mb()
+    print(f"{label:<10} {elapsed:>9.2f}s {after - before:>10.1f} MB {len(sym_spell.words):>10}")
+    return sym_spell
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dictionary", default=os.path.join("data", "full_dictionary_v7_suffix_stacking.txt"))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.dictionary):
+        raise SystemExit(f"Dictionary not found: {args.dictionary}")
+    snapshot_path = snapshot_path_for(args.dictionary)
+    key = snapshot_key(args.dictionary, SYMSPELL_MAX_EDIT_DISTANCE, SYMSPELL_PREFIX_LENGTH)
+
+    def from_text():
+        sym_spell = new_symspell()
+        sym_spell.load_dictionary(args.dictionary, term_index=0, count_index=1)
+        return sym_spell
+
+    def from_snapshot():
+        sym_spell = new_symspell()
+        if not load_snapshot(sym_spell, snapshot_path, key):
+            raise SystemExit(f"Snapshot {snapshot_path} is stale or unreadable.")
+        return sym_spell
+
+    print(f"{'source':<10} {'time':>10} {'rss delta':>13} {'words':>10}")
+    sym_spell = measure("text", from_text)
+    save_snapshot(sym_spell, snapshot_path, key)
+    del sym_spell
+
+    first = measure("snapshot", from_snapshot)
+    del first
+    measure("warm", from_snapshot)
+
+    print(f"\nsnapshot size: {os.path.getsize(snapshot_path) / (1 << 20):.1f} MB")
+    print(f"peak rss: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()